@@ -0,0 +1,115 @@
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Startup benchmark:
+# Import time report (python -X importtime) for `import main`, and the time from launch until the main window is shown.
+# Run from the repo root: python -m benchmarks.startup_time
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# The main window should be up well within this (seconds)
+WINDOW_TARGET = 1.0
+
+# Modules that `import main` must not import
+DEFERRED_MODULES = ("numpy", "requests", "urllib3", "sklearn", "joblib", "utils.abo_model")
+
+# Child process: shows the window, then quits
+_SHOW_WINDOW = """
+import os, sys
+from PyQt6.QtWidgets import QApplication
+import main
+app = QApplication(sys.argv)
+window = main.MainWindow()
+window.show()
+app.processEvents()
+os._exit(0)
+"""
+
+# Sources the app needs to start, copied for a cold run
+APP_SOURCES = ("main.py", "data", "utils", "views", "resources")
+
+def _cold_copy(directory: Path) -> Path:
+    # Copy of the app without any compiled bytecode, so every app module is compiled again like on the first launch
+    for name in APP_SOURCES:
+        src = REPO_DIR / name
+        if src.is_dir():
+            shutil.copytree(src, directory / name, ignore=shutil.ignore_patterns("__pycache__"))
+        else:
+            shutil.copy2(src, directory / name)
+    return directory
+
+def _run(args: list[str], app_dir: Path, cold: bool) -> subprocess.CompletedProcess:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    if cold:
+        # Keep the copy cold for the next run too
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return subprocess.run([sys.executable, *args], cwd=app_dir, env=env, capture_output=True, text=True)
+
+def import_report(app_dir: Path = REPO_DIR, cold: bool = False) -> list[tuple[int, int, str]]:
+    """
+    Runs `python -X importtime -c "import main"` and parses its report.
+    Returns (self us, cumulative us, module) for every import, in import order.
+    """
+    proc = _run(["-X", "importtime", "-c", "import main"], app_dir, cold)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import main failed")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+def time_to_window(app_dir: Path = REPO_DIR, cold: bool = False) -> float:
+    # Seconds from launching the interpreter until the window has been shown
+    start = time.perf_counter()
+    proc = _run(["-c", _SHOW_WINDOW], app_dir, cold)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip() or "showing the window failed")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Import time report and time until the main window is shown.")
+    parser.add_argument("--runs", type=int, default=5, help="window launches to time (default 5)")
+    parser.add_argument("--top", type=int, default=15, help="modules to list in the import report (default 15)")
+    parser.add_argument("--cold", action="store_true", help="run a copy of the app without compiled bytecode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app_dir = _cold_copy(Path(tmp)) if args.cold else REPO_DIR
+
+        # 1.) Import time report, slowest modules (cumulative) first
+        rows = import_report(app_dir, args.cold)
+        total = next((cumulative for _, cumulative, name in rows if name == "main"), 0)
+        print(f"import main: {total / 1000:.1f} ms")
+        print(f"{'self ms':>9} {'cumul. ms':>10}  module")
+        for self_us, cumulative_us, name in sorted(rows, key=lambda row: row[1], reverse=True)[:args.top]:
+            print(f"{self_us / 1000:9.1f} {cumulative_us / 1000:10.1f}  {name}")
+
+        # 2.) Launch until the window is shown
+        times = [time_to_window(app_dir, args.cold) for _ in range(args.runs)]
+
+    # Heavy modules are loaded on first use, `import main` shouldn't pull them in
+    imported = sorted({name for _, _, name in rows if name in DEFERRED_MODULES})
+    print()
+    print(f"window shown after {statistics.median(times):.3f}s median, "
+          f"{min(times):.3f}s best, {max(times):.3f}s worst ({args.runs} runs{', cold' if args.cold else ''})")
+    if imported:
+        print(f"imported by `import main`: {', '.join(imported)}")
+    if statistics.median(times) > WINDOW_TARGET:
+        print(f"slower than the {WINDOW_TARGET:.1f}s target")
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
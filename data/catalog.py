@@ -0,0 +1,256 @@
+import zlib
+from bisect import bisect_left
+from typing import Any, Dict, List
+from utils.stats import ARTIFACT_BONUS, ARTIFACT_TO_ARMOR_STAT
+
+# Catalog records:
+# armor.json / artifact.json entries are checked once when they are loaded and turned into
+# small __slots__ records, so the rest of the app never has to int() or ARTIFACT_BONUS map a stat again.
+
+# Armor resistance keys
+RESIST_KEYS: List[str] = ["thermal", "electrical", "chemical", "radiation", "psi", "physical"]
+
+# Artifact stat keys the app knows about (unknown ones are ignored)
+ARTIFACT_STATS: List[str] = [
+    "thermal_protection",
+    "electrical_protection",
+    "chemical_protection",
+    "physical_protection",
+    "psi",
+    "endurance",
+    "increased_durability",
+    "bleeding_resistance",
+    "weight",
+    "radiation",
+    "radio_protection",
+]
+
+
+class CatalogError(ValueError):
+    """An armor.json / artifact.json entry that can't be used"""
+
+
+# Stable id from the name, so the same item keeps its id between runs and catalog updates
+def catalog_id(kind: str, name: str) -> int:
+    return zlib.crc32(f"{kind}:{name}".encode("utf-8")) & 0x7FFFFFFF
+
+def _name(data: Any) -> str:
+    if not isinstance(data, dict):
+        raise CatalogError(f"expected an object, got {type(data).__name__}")
+    name = data.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise CatalogError("missing name")
+    return name
+
+def _int(value: Any, field: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise CatalogError(f"{field} is not a number: {value!r}")
+
+def _image_url(data: Dict, image_base: str) -> str:
+    rel_path = data.get("image", "") or ""
+    return image_base + rel_path if rel_path else ""
+
+
+class Armor:
+    """
+    One suit of armor.
+    resistances are 0-100 ints for every key in RESIST_KEYS
+    """
+    __slots__ = ("id", "name", "image_url", "resistances",
+        "slots_base", "slots_total", "lead_containers_base", "lead_containers_total")
+
+    def __init__(self, id: int, name: str, image_url: str, resistances: Dict[str, int],
+        slots_base: int, slots_total: int, lead_containers_base: int, lead_containers_total: int,):
+        self.id = id
+        self.name = name
+        self.image_url = image_url
+        self.resistances = resistances
+        self.slots_base = slots_base
+        self.slots_total = slots_total
+        self.lead_containers_base = lead_containers_base
+        self.lead_containers_total = lead_containers_total
+
+    @classmethod
+    def from_json(cls, data: Any, image_base: str = "") -> "Armor":
+        name = _name(data)
+        res = data.get("resistances", {}) or {}
+        if not isinstance(res, dict):
+            raise CatalogError("resistances must be an object")
+        resistances = {key: _int(res.get(key, 0), key) for key in RESIST_KEYS}
+
+        slots_base = _int(data.get("slots_base", 0), "slots_base")
+        slots_total = _int(data.get("slots_total", slots_base), "slots_total")
+        lead_base = _int(data.get("lead_containers_base", 0), "lead_containers_base")
+        lead_total = _int(data.get("lead_containers_total", lead_base), "lead_containers_total")
+        if slots_base < 0 or slots_total < slots_base:
+            raise CatalogError(f"bad slot range {slots_base}-{slots_total}")
+        if lead_base < 0 or lead_total < lead_base:
+            raise CatalogError(f"bad lead container range {lead_base}-{lead_total}")
+
+        return cls(
+            id=_int(data["id"], "id") if "id" in data else catalog_id("armor", name),
+            name=name,
+            image_url=_image_url(data, image_base),
+            resistances=resistances,
+            slots_base=slots_base,
+            slots_total=slots_total,
+            lead_containers_base=lead_base,
+            lead_containers_total=lead_total,
+        )
+
+    def __repr__(self) -> str:
+        return f"Armor({self.id}, {self.name!r})"
+
+
+class Artifact:
+    """
+    One artifact.
+    bonus holds the ARTIFACT_BONUS value of every stat it has (levels aren't kept, the bonus is all that's used).
+    resist_bonus is the same as (armor resistance, bonus) pairs and radiation_balance is
+    radio protection - radiation, which is all the resistance screens need.
+    """
+    __slots__ = ("id", "name", "description", "image_url", "bonus", "resist_bonus", "radiation_balance")
+
+    def __init__(self, id: int, name: str, description: str, image_url: str, levels: Dict[str, int]):
+        self.id = id
+        self.name = name
+        self.description = description
+        self.image_url = image_url
+        self.bonus = {key: ARTIFACT_BONUS[lvl] for key, lvl in levels.items()}
+        self.resist_bonus = tuple(
+            (ARTIFACT_TO_ARMOR_STAT[key], value)
+            for key, value in self.bonus.items()
+            if key in ARTIFACT_TO_ARMOR_STAT
+        )
+        self.radiation_balance = self.bonus.get("radio_protection", 0) - self.bonus.get("radiation", 0)
+
+    @classmethod
+    def from_json(cls, data: Any, image_base: str = "") -> "Artifact":
+        name = _name(data)
+        stats = data.get("stats", {}) or {}
+        if not isinstance(stats, dict):
+            raise CatalogError("stats must be an object")
+        levels = {}
+        for key in ARTIFACT_STATS:
+            if key not in stats:
+                continue
+            lvl = _int(stats[key], key)
+            if lvl != 0 and lvl not in ARTIFACT_BONUS:
+                raise CatalogError(f"{key} level {lvl} is out of range")
+            if lvl:
+                levels[key] = lvl
+
+        return cls(
+            id=_int(data["id"], "id") if "id" in data else catalog_id("artifact", name),
+            name=name,
+            description=data.get("description", "") or "",
+            image_url=_image_url(data, image_base),
+            levels=levels,
+        )
+
+    def __repr__(self) -> str:
+        return f"Artifact({self.id}, {self.name!r})"
+
+
+def parse_records(items: Any, record_type, image_base: str = "") -> list:
+    """
+    Validate raw JSON entries into records.
+    Entries that fail validation are skipped (with a message) so one bad entry doesn't hide the catalog.
+    Two entries with the same id keep the first one.
+    """
+    if not isinstance(items, list):
+        print(f"Failed to load {record_type.__name__} data: expected a list")
+        return []
+
+    records = []
+    seen_ids = set()
+    for i, data in enumerate(items):
+        try:
+            record = record_type.from_json(data, image_base)
+        except CatalogError as e:
+            print(f"Skipping {record_type.__name__.lower()} #{i}: {e}")
+            continue
+        if record.id in seen_ids:
+            print(f"Skipping {record_type.__name__.lower()} {record.name!r}: duplicate id {record.id}")
+            continue
+        seen_ids.add(record.id)
+        records.append(record)
+    return records
+
+class Catalog:
+    """
+    The loaded armor and artifacts plus the lookups the app needs, built once at load:
+    1.) id and name maps for both (names are matched case insensitively)
+    2.) an inverted index per artifact stat, sorted by level, so
+        "artifacts with chemical protection >= 3" is a bisect instead of a scan
+    """
+
+    def __init__(self, armors: List[Armor], artifacts: List[Artifact]):
+        self.armors = list(armors)
+        self.artifacts = list(artifacts)
+
+        self.armor_by_id: Dict[int, Armor] = {armor.id: armor for armor in self.armors}
+        self.artifact_by_id: Dict[int, Artifact] = {art.id: art for art in self.artifacts}
+        self.armor_by_name: Dict[str, Armor] = {armor.name.lower(): armor for armor in self.armors}
+        self.artifact_by_name: Dict[str, Artifact] = {art.name.lower(): art for art in self.artifacts}
+
+        # Catalog position of every artifact, so query results keep the catalog order
+        self._position: Dict[int, int] = {art.id: i for i, art in enumerate(self.artifacts)}
+
+        # stat -> (bonus values ascending, artifacts in the same order)
+        self._by_stat: Dict[str, tuple] = {}
+        for stat in ARTIFACT_STATS:
+            posting = sorted(
+                (art.bonus[stat], i) for i, art in enumerate(self.artifacts) if stat in art.bonus
+            )
+            self._by_stat[stat] = (
+                [value for value, _ in posting],
+                [self.artifacts[i] for _, i in posting],
+            )
+
+    def artifact(self, artifact_id: int) -> Artifact | None:
+        return self.artifact_by_id.get(artifact_id)
+
+    def armor(self, armor_id: int) -> Armor | None:
+        return self.armor_by_id.get(armor_id)
+
+    def find_artifact(self, name: str) -> Artifact | None:
+        return self.artifact_by_name.get(name.lower())
+
+    def find_armor(self, name: str) -> Armor | None:
+        return self.armor_by_name.get(name.lower())
+
+    def ordered(self, artifacts: List[Artifact]) -> List[Artifact]:
+        # Catalog artifacts sorted back into catalog order
+        return sorted(artifacts, key=lambda art: self._position[art.id])
+
+    def with_stat(self, stat: str, min_level: int = 1) -> List[Artifact]:
+        # Artifacts with stat at min_level or higher, highest level first
+        values, arts = self._by_stat.get(stat, ([], []))
+        start = bisect_left(values, _min_bonus(min_level))
+        return arts[start:][::-1]
+
+    def matching(self, min_levels: Dict[str, int]) -> List[Artifact]:
+        """
+        Artifacts that have every stat in min_levels at that level or higher, in catalog order.
+        Starts from the shortest stat list and only checks those artifacts against the rest.
+        An empty min_levels matches every artifact.
+        """
+        if not min_levels:
+            return list(self.artifacts)
+        postings = sorted((self.with_stat(stat, lvl) for stat, lvl in min_levels.items()), key=len)
+        rest = [(stat, _min_bonus(lvl)) for stat, lvl in min_levels.items()]
+        found = [
+            art for art in postings[0]
+            if all(art.bonus.get(stat, 0) >= min_bonus for stat, min_bonus in rest)
+        ]
+        return self.ordered(found)
+
+
+# Bonus value a level has to reach (levels below 1 match any artifact that has the stat)
+def _min_bonus(level: int) -> int:
+    if level > max(ARTIFACT_BONUS):
+        return max(ARTIFACT_BONUS.values()) + 1
+    return ARTIFACT_BONUS.get(level, 0)
\ No newline at end of file
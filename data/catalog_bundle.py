@@ -0,0 +1,145 @@
+import argparse
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+# Offline catalog bundle:
+# One file with armor.json, artifact.json and every image, for machines with no network.
+# Layout: header | blobs | index
+#   header = magic, index offset, index length (little endian)
+#   index  = JSON {name: [offset, length]} where name is the path inside the data repo
+#            (ex. "armor.json", "images/artifacts/flash.png")
+# The file is memory mapped, so reading an entry is a slice with no file open.
+
+BUNDLE_MAGIC = b"ABOBNDL1"
+_HEADER = struct.Struct("<8sQQ")
+
+
+class CatalogBundle:
+    """
+    Read only view of a bundle file through mmap.
+    Raises ValueError if the file isn't a bundle.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, index_offset, index_length = _HEADER.unpack_from(self._mm, 0)
+            if magic != BUNDLE_MAGIC:
+                raise ValueError(f"{self.path} is not a catalog bundle")
+            index = json.loads(self._mm[index_offset:index_offset + index_length])
+        except (struct.error, ValueError):
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a valid catalog bundle")
+        self._index = {name: (offset, length) for name, (offset, length) in index.items()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def names(self) -> list:
+        return list(self._index)
+
+    # Bytes of an entry, None if the bundle doesn't have it
+    def read(self, name: str) -> bytes | None:
+        entry = self._index.get(name)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._mm[offset:offset + length]
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+def write_bundle(path: Path, entries: dict) -> None:
+    """
+    Write {name: bytes} to a bundle file.
+    Written to a temp file first so a half written bundle never replaces a good one
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    index = {}
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(BUNDLE_MAGIC, 0, 0))
+        for name, content in entries.items():
+            index[name] = [f.tell(), len(content)]
+            f.write(content)
+        index_bytes = json.dumps(index).encode("utf-8")
+        index_offset = f.tell()
+        f.write(index_bytes)
+        f.seek(0)
+        f.write(_HEADER.pack(BUNDLE_MAGIC, index_offset, len(index_bytes)))
+    os.replace(tmp_path, path)
+
+
+def build_bundle(cache_dir: Path, out_path: Path) -> dict:
+    """
+    Build a bundle from what the app has cached.
+    1.) armor.json and artifact.json come from the catalog cache
+    2.) Every image they reference is taken from the image cache
+    Returns counts of what was bundled and which images were missing.
+    Raises FileNotFoundError if the catalog isn't cached yet (run the app online once).
+    """
+    # Imported here, data_client imports this module to read bundles
+    from data.data_client import ARMOR_JSON_URL, ARTIFACT_JSON_URL, BASE_URL, IMAGE_URL, _cache_paths
+    from utils.image_cache import ImageCache
+
+    cache_dir = Path(cache_dir)
+    entries = {}
+    image_paths = []
+    for url, root_key in ((ARMOR_JSON_URL, "armor"), (ARTIFACT_JSON_URL, "artifacts")):
+        data_path, _ = _cache_paths(url, cache_dir / "catalog")
+        try:
+            content = data_path.read_bytes()
+            items = json.loads(content).get(root_key, [])
+        except (OSError, ValueError, AttributeError):
+            raise FileNotFoundError(f"No cached copy of {url} in {cache_dir}")
+        entries[url[len(BASE_URL):]] = content
+        image_paths.extend(item.get("image", "") for item in items if item.get("image"))
+
+    image_cache = ImageCache(cache_dir / "images")
+    missing = []
+    for rel_path in dict.fromkeys(image_paths):
+        content = image_cache.get(IMAGE_URL + rel_path)
+        if content is None:
+            missing.append(rel_path)
+        else:
+            entries["images/" + rel_path] = content
+
+    write_bundle(out_path, entries)
+    return {
+        "documents": 2,
+        "images": len(entries) - 2,
+        "missing_images": missing,
+        "bytes": Path(out_path).stat().st_size,
+    }
+
+
+def main():
+    from data.data_client import BUNDLE_PATH, CACHE_DIR
+
+    parser = argparse.ArgumentParser(description="Build an offline catalog bundle from the local cache.")
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help=f"cache directory (default {CACHE_DIR})")
+    parser.add_argument("--out", type=Path, default=BUNDLE_PATH, help=f"bundle file (default {BUNDLE_PATH})")
+    args = parser.parse_args()
+
+    try:
+        report = build_bundle(args.cache_dir, args.out)
+    except FileNotFoundError as e:
+        print(f"Failed to build bundle: {e}")
+        raise SystemExit(1)
+
+    print(f"Wrote {args.out} ({report['bytes']} bytes, {report['images']} images)")
+    if report["missing_images"]:
+        print(f"{len(report['missing_images'])} images were not cached and are left out")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,42 +1,281 @@
-import requests
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from data.catalog import Armor, Artifact, Catalog, parse_records
+from data.catalog_bundle import CatalogBundle
+from data.manifest import ENTRIES_DIR, MANIFEST_NAME, MANIFEST_VERSION, entry_hash
+from utils.http_session import http_get
 
 
 # GitHub Data URL
-BASE_URL = "https://raw.githubusercontent.com/Saintxc/ArtifactBuildOptimizerData/main/"
+# ABO_DATA_URL points the app at another copy of the data repo (ex. a local test server)
+BASE_URL = os.environ.get("ABO_DATA_URL", "https://raw.githubusercontent.com/Saintxc/ArtifactBuildOptimizerData/main/")
 
 ARMOR_JSON_URL = BASE_URL + "armor.json"
 ARTIFACT_JSON_URL = BASE_URL + "artifact.json"
 IMAGE_URL = BASE_URL + "images/"
+MANIFEST_URL = BASE_URL + MANIFEST_NAME
+ENTRY_URL = BASE_URL + ENTRIES_DIR + "/"
 
-def _fetch_json(url: str, root_key: str):
-    # Fetch JSON safely
+# Local cache so the app starts fast and still works offline
+# ABO_CACHE_DIR moves it somewhere else
+CACHE_DIR = Path(os.environ.get("ABO_CACHE_DIR", Path.home() / ".cache" / "ArtifactBuildOptimizer"))
+CATALOG_CACHE_DIR = CACHE_DIR / "catalog"
+
+# Offline bundle (see data/catalog_bundle.py), used instead of the network when it exists
+# ABO_BUNDLE_PATH points at another bundle file
+BUNDLE_PATH = Path(os.environ.get("ABO_BUNDLE_PATH", CACHE_DIR / "catalog.abobundle"))
+
+# Without a cached copy we wait for the download, with one we only wait a moment for revalidation
+FETCH_TIMEOUT = 10
+REVALIDATE_TIMEOUT = 2
+
+# If more than this share of a document's entries changed, one full download beats many small ones
+DELTA_MAX_CHANGED = 0.5
+
+_bundle: CatalogBundle | None = None
+_bundle_checked = False
+_bundle_lock = threading.Lock()
+
+# The bundle is opened once, None if there isn't one (or it is broken)
+def _get_bundle() -> CatalogBundle | None:
+    global _bundle, _bundle_checked
+    with _bundle_lock:
+        if not _bundle_checked:
+            _bundle_checked = True
+            if BUNDLE_PATH.exists():
+                try:
+                    _bundle = CatalogBundle(BUNDLE_PATH)
+                except (OSError, ValueError) as e:
+                    print(f"Failed to open catalog bundle: {e}")
+        return _bundle
+
+def read_bundled(url: str) -> bytes | None:
+    # Bytes of a data repo file (JSON or image) from the offline bundle, None if it isn't bundled
+    if not url.startswith(BASE_URL):
+        return None
+    bundle = _get_bundle()
+    if bundle is None:
+        return None
+    return bundle.read(url[len(BASE_URL):])
+
+# Data file and metadata file (ETag / Last-Modified) for a URL
+def _cache_paths(url: str, cache_dir: Path) -> tuple:
+    name = url.rstrip("/").rsplit("/", 1)[-1] or "index"
+    # Short hash of the URL so two data sources never share a file
+    prefix = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    return cache_dir / f"{prefix}_{name}", cache_dir / f"{prefix}_{name}.meta.json"
+
+# Cached JSON and its metadata, (None, {}) if there is no usable copy
+def _read_cached(url: str, cache_dir: Path) -> tuple:
+    data_path, meta_path = _cache_paths(url, cache_dir)
     try:
-        response = requests.get(url, timeout=10)
+        data = json.loads(data_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None, {}
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        meta = {}
+    return data, meta
+
+# Write to a temp file first so a crash never leaves half a document in the cache
+def _atomic_write(path: Path, content: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+def _write_cached(url: str, cache_dir: Path, content: bytes, headers) -> None:
+    data_path, meta_path = _cache_paths(url, cache_dir)
+    meta = {
+        "url": url,
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+    }
+    try:
+        _atomic_write(data_path, content)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+    except OSError as e:
+        # A read only cache directory shouldn't stop the app from working
+        print(f"Failed to cache {url}: {e}")
+
+def _fetch_document(url: str, cache_dir: Path | None = None, quiet: bool = False):
+    """
+    Fetch a JSON document through the local cache.
+    1.) If the offline bundle has the document it is used with no network access
+    2.) A cached copy is revalidated with If-None-Match / If-Modified-Since
+    3.) 304 Not Modified keeps the cached copy, 200 replaces it
+    4.) If the network is slow or down the cached copy is used straight away
+    Returns None if there is no network and no cached copy (quiet skips the message)
+    """
+    bundled = read_bundled(url)
+    if bundled is not None:
+        try:
+            return json.loads(bundled)
+        except ValueError as e:
+            print(f"Failed to read {url} from the bundle: {e}")
+
+    cache_dir = CATALOG_CACHE_DIR if cache_dir is None else cache_dir
+    cached, meta = _read_cached(url, cache_dir)
+
+    headers = {}
+    if cached is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    try:
+        # With a cached copy to fall back on, don't wait for retries
+        if cached is not None:
+            response = http_get(url, headers=headers, timeout=REVALIDATE_TIMEOUT, retry=False)
+        else:
+            response = http_get(url, timeout=FETCH_TIMEOUT)
+        if response.status_code == 304 and cached is not None:
+            return cached
         response.raise_for_status()
         data = response.json()
-        return data.get(root_key, [])
+        _write_cached(url, cache_dir, response.content, response.headers)
+        return data
+    except Exception as e:
+        if cached is not None:
+            print(f"Using cached copy of {url}: {e}")
+            return cached
+        if not quiet:
+            print(f"Failed to load JSON from {url}: {e}")
+        return None
+
+_manifest: dict | None = None
+_manifest_checked = False
+_manifest_lock = threading.Lock()
+
+# The manifest is fetched once per run and shared by both document workers
+# None if the data repo doesn't publish one (the documents are then downloaded whole)
+def _get_manifest(cache_dir: Path | None = None) -> dict | None:
+    global _manifest, _manifest_checked
+    with _manifest_lock:
+        if not _manifest_checked:
+            _manifest_checked = True
+            data = _fetch_document(MANIFEST_URL, cache_dir, quiet=True)
+            if isinstance(data, dict) and data.get("version") == MANIFEST_VERSION:
+                _manifest = data
+                _discard_stale_images(data)
+        return _manifest
+
+# Cached images whose hash isn't the one in the manifest anymore are dropped,
+# so only the changed ones are downloaded again
+def _discard_stale_images(manifest: dict) -> None:
+    # Imported here, the image cache imports this module for CACHE_DIR
+    from utils.image_cache import IMAGE_CACHE
+    images = manifest.get("images", {}) or {}
+    IMAGE_CACHE.discard_changed({IMAGE_URL + rel_path: digest for rel_path, digest in images.items()})
+
+def _fetch_entry(digest: str):
+    # One catalog entry from entries/<hash>.json, None if it can't be downloaded or doesn't match its hash
+    try:
+        response = http_get(ENTRY_URL + digest + ".json", timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        entry = response.json()
     except Exception as e:
-        print(f"Failed to load JSON from {url}: {e}")
+        print(f"Failed to load catalog entry {digest}: {e}")
+        return None
+    if entry_hash(entry) != digest:
+        print(f"Catalog entry {digest} doesn't match its hash")
+        return None
+    return entry
+
+def _fetch_delta(url: str, root_key: str, cache_dir: Path | None = None):
+    """
+    Update the cached copy of a document from the manifest, downloading only the entries that changed.
+    1.) Entries already in the cached copy are matched by their hash
+    2.) Changed / new entries are downloaded one by one and checked against their hash
+    3.) The merged document (in manifest order) replaces the cached copy
+    Returns None if the manifest can't be used (no manifest, no cached copy, too much changed,
+    or an entry failed to download), the caller then falls back to the whole document.
+    """
+    if _get_bundle() is not None:
+        return None
+    cache_dir = CATALOG_CACHE_DIR if cache_dir is None else cache_dir
+    manifest = _get_manifest(cache_dir)
+    if manifest is None:
+        return None
+    doc = (manifest.get("documents", {}) or {}).get(url[len(BASE_URL):])
+    cached, _ = _read_cached(url, cache_dir)
+    if not isinstance(doc, dict) or not isinstance(cached, dict) or not isinstance(cached.get(root_key), list):
+        return None
+
+    hashes = doc.get("entries", [])
+    cached_hashes = [entry_hash(entry) for entry in cached[root_key]]
+    if cached_hashes == hashes:
+        return cached
+
+    known = dict(zip(cached_hashes, cached[root_key]))
+    missing = [digest for digest in dict.fromkeys(hashes) if digest not in known]
+    if len(missing) > DELTA_MAX_CHANGED * len(hashes):
+        return None
+    for digest in missing:
+        entry = _fetch_entry(digest)
+        if entry is None:
+            return None
+        known[digest] = entry
+
+    merged = dict(cached)
+    merged[root_key] = [known[digest] for digest in hashes]
+    # No ETag, the manifest decides when this copy is out of date
+    _write_cached(url, cache_dir, json.dumps(merged).encode("utf-8"), {})
+    return merged
+
+def _fetch_json(url: str, root_key: str, cache_dir: Path | None = None):
+    # Fetch JSON safely, only the changed entries if the data repo has a manifest
+    data = _fetch_delta(url, root_key, cache_dir)
+    if data is None:
+        data = _fetch_document(url, cache_dir)
+    if not isinstance(data, dict):
         return []
+    return data.get(root_key, [])
 
-def load_armor_data():
-    # Return list of armor with images
-    armors = _fetch_json(ARMOR_JSON_URL, "armor")
-    for armor in armors:
-        rel_path = armor.get("image", "")
-        if rel_path:
-            armor["image_url"] = IMAGE_URL + rel_path
-        else:
-            armor["image_url"] = ""
-    return armors
-
-def load_artifact_data():
-    # Return list of artifacts with images
-    artifacts = _fetch_json(ARTIFACT_JSON_URL, "artifacts")
-    for art in artifacts:
-        rel_path = art.get("image", "")
-        if rel_path:
-            art["image_url"] = IMAGE_URL + rel_path
-        else:
-            art["image_url"] = ""
-    return artifacts
\ No newline at end of file
+def load_armor_data() -> list[Armor]:
+    # Return list of validated armor records with image URLs
+    return parse_records(_fetch_json(ARMOR_JSON_URL, "armor"), Armor, IMAGE_URL)
+
+def load_artifact_data() -> list[Artifact]:
+    # Return list of validated artifact records with image URLs
+    return parse_records(_fetch_json(ARTIFACT_JSON_URL, "artifacts"), Artifact, IMAGE_URL)
+
+# One worker per document so armor.json and artifact.json download at the same time
+_CATALOG_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="abo-catalog")
+
+def load_catalog_async(callback=None) -> Future:
+    """
+    Fetches armor.json and artifact.json concurrently in the background.
+    Returns a Future that resolves to a Catalog (records plus their id/name/stat indexes).
+    callback(catalog) is called on the worker thread once both are loaded,
+    GUI code should hand the result over to the main thread (ex. with a queued signal)
+    """
+    armor_future = _CATALOG_EXECUTOR.submit(load_armor_data)
+    artifact_future = _CATALOG_EXECUTOR.submit(load_artifact_data)
+    catalog_future: Future = Future()
+    lock = threading.Lock()
+
+    # Runs when either download finishes, only the second one completes the catalog
+    def _finish(_):
+        with lock:
+            if catalog_future.done() or not (armor_future.done() and artifact_future.done()):
+                return
+            try:
+                catalog_future.set_result(Catalog(armor_future.result(), artifact_future.result()))
+            except Exception as e:
+                catalog_future.set_exception(e)
+
+    armor_future.add_done_callback(_finish)
+    artifact_future.add_done_callback(_finish)
+
+    if callback is not None:
+        catalog_future.add_done_callback(lambda f: callback(f.result()))
+    return catalog_future
\ No newline at end of file
@@ -0,0 +1,85 @@
+import argparse
+import hashlib
+import json
+from pathlib import Path
+
+# Catalog manifest:
+# manifest.json in the data repo lists a content hash for every armor / artifact entry and every image,
+# so the app can tell exactly what changed and only download that.
+# {
+#   "version": 1,
+#   "documents": {"armor.json": {"root": "armor", "entries": [<entry hash>, ...]}, ...},
+#   "images": {"<path under images/>": <sha256 of the file>, ...}
+# }
+# Every entry is also published as entries/<entry hash>.json, so a changed entry is one small download.
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+ENTRIES_DIR = "entries"
+
+# Catalog documents and the key their entry list is under
+DOCUMENTS = {
+    "armor.json": "armor",
+    "artifact.json": "artifacts",
+}
+
+
+def _canonical(entry) -> bytes:
+    return json.dumps(entry, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+# Hash of one entry, independent of key order and whitespace in the source file
+def entry_hash(entry) -> str:
+    return hashlib.sha256(_canonical(entry)).hexdigest()
+
+# Hash of an image file, the same hash the image cache stores images under
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def build_manifest(data_dir: Path) -> dict:
+    """
+    Writes manifest.json and entries/ into a checkout of the data repo.
+    1.) Every entry of armor.json / artifact.json is hashed and written to entries/<hash>.json
+    2.) Every file under images/ is hashed
+    3.) manifest.json lists the entry hashes (in document order) and the image hashes
+    Returns the manifest.
+    """
+    data_dir = Path(data_dir)
+    entries_dir = data_dir / ENTRIES_DIR
+    entries_dir.mkdir(parents=True, exist_ok=True)
+
+    documents = {}
+    for name, root_key in DOCUMENTS.items():
+        entries = json.loads((data_dir / name).read_text(encoding="utf-8")).get(root_key, [])
+        hashes = []
+        for entry in entries:
+            digest = entry_hash(entry)
+            entry_path = entries_dir / f"{digest}.json"
+            if not entry_path.exists():
+                entry_path.write_bytes(_canonical(entry))
+            hashes.append(digest)
+        documents[name] = {"root": root_key, "entries": hashes}
+
+    images = {}
+    image_dir = data_dir / "images"
+    if image_dir.is_dir():
+        for path in sorted(image_dir.rglob("*")):
+            if path.is_file():
+                images[path.relative_to(image_dir).as_posix()] = content_hash(path.read_bytes())
+
+    manifest = {"version": MANIFEST_VERSION, "documents": documents, "images": images}
+    (data_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=1), encoding="utf-8")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write manifest.json and entries/ for a checkout of the data repo.")
+    parser.add_argument("data_dir", type=Path, help="folder with armor.json, artifact.json and images/")
+    args = parser.parse_args()
+
+    manifest = build_manifest(args.data_dir)
+    entry_count = sum(len(doc["entries"]) for doc in manifest["documents"].values())
+    print(f"Wrote {args.data_dir / MANIFEST_NAME} ({entry_count} entries, {len(manifest['images'])} images)")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
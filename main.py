@@ -1,15 +1,18 @@
 import sys
+import threading
 from pathlib import Path
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel, QStackedWidget)
-from data.data_client import load_armor_data, load_artifact_data
+from data.catalog import Artifact, Catalog
+from data.data_client import load_catalog_async
 from views.armor_selection_view import ArmorSelectionView
 from views.armor_config_view import ArmorConfigView
 from views.artifact_selection_view import ArtifactSelectionView
 from views.artifact_config_view import ArtifactConfigView
 from views.build_results_view import BuildResultsView
-from utils.abo_model import run_model
+# utils.abo_model (the optimizer, with NumPy) is imported where it is first used,
+# so importing it doesn't hold up the window
 
 
 # Where our files live so image can load reliably
@@ -18,11 +21,22 @@ RES_DIR = BASE_DIR / "resources" / "images"
 PDA_BACKGROUND = RES_DIR / "ABO_PDA.png"
 
 
+# Runs on a worker thread: imports the optimizer and loads its ML model
+def _preload_model():
+    from utils.abo_model import load_ml_model
+    load_ml_model()
+
+
 class MainWindow(QMainWindow):
     """
     Main window class acts as the controller. It manages the data and
     decides which screen is currently visible to the user.
     """
+    # Emitted from the background worker when the alternate builds are done (armor config, results)
+    alternate_ready = pyqtSignal(object, object)
+    # Emitted from the catalog loader when armor.json and artifact.json are in (Catalog)
+    catalog_loaded = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
 
@@ -50,17 +64,20 @@ class MainWindow(QMainWindow):
         central_layout.addWidget(self.stack)
 
         # 5.) Load data (Armor and Artifacts)
-        armors = load_armor_data()
-        artifacts = load_artifact_data()
+        # Both documents download in the background, the window paints straight away with a loading state
+        # Full catalog (with its indexes) is kept for the alternate build
+        self._catalog = Catalog([], [])
 
         # Saves users armor configuration while artifacts are selected
         self._armor_config: dict | None = None
+        # Last payload sent to the model, used for the armor upgrade sweep
+        self._last_payload: dict | None = None
 
         # 6.) Initialize views
         # Create instances of the screens and pass the data they need to function
-        self.armor_selection_view = ArmorSelectionView(armors)
+        self.armor_selection_view = ArmorSelectionView()
         self.armor_config_view: ArmorConfigView | None = None
-        self.artifact_selection_view = ArtifactSelectionView(artifacts)
+        self.artifact_selection_view = ArtifactSelectionView()
         self.artifact_config_view = ArtifactConfigView()
         self.build_results_view = BuildResultsView()
 
@@ -82,6 +99,20 @@ class MainWindow(QMainWindow):
         self.artifact_config_view.next_requested.connect(self._on_artifact_config_done)
         self.artifact_config_view.back_requested.connect(self._show_armor_config)
         self.build_results_view.back_requested.connect(self._show_artifact_config)
+        # Queued across threads, so the results view is only touched on the GUI thread
+        self.alternate_ready.connect(self._on_alternate_ready)
+        self.build_results_view.sweep_requested.connect(self._on_sweep_requested)
+        self.catalog_loaded.connect(self._on_catalog_loaded)
+
+        # Start the download last so the signal is already connected
+        load_catalog_async(callback=self.catalog_loaded.emit)
+
+        # 8.) Preload the optimizer and ML model in the background once the window is up
+        # so the first "Generate" doesn't wait for them. Builds made before it is ready use the heuristic alone
+        QTimer.singleShot(0, self._start_model_preload)
+
+    def _start_model_preload(self):
+        threading.Thread(target=_preload_model, name="abo-model-preload", daemon=True).start()
 
     def _setup_background(self):
         bg_label = QLabel(self)
@@ -92,6 +123,15 @@ class MainWindow(QMainWindow):
             bg_label.setGeometry(0, 0, 1600, 900)
             bg_label.lower()
 
+    # Fill the selection screens once the catalog is in
+    def _on_catalog_loaded(self, catalog: Catalog):
+        self._catalog = catalog
+        self.armor_selection_view.set_armors(catalog.armors)
+        self.artifact_selection_view.set_catalog(catalog)
+        # If the armor was configured while loading, the alternate build still needs the full catalog
+        if self._armor_config is not None:
+            self._request_alternate(self._armor_config)
+
     # Navigation
     def _on_armor_chosen(self, armor_dict: dict):
         # If a config view exists from a previous instance of the app, destroy it and reset the state
@@ -133,24 +173,60 @@ class MainWindow(QMainWindow):
         self.artifact_selection_view.set_context(armor, slots, containers)
         self.stack.setCurrentWidget(self.artifact_selection_view)
 
+        # Start the alternate build while the user is still picking artifacts
+        self._request_alternate(armor_config)
+
+    def _request_alternate(self, armor_config: dict):
+        from utils.abo_model import request_alternate_builds
+        self.build_results_view.set_alternate_results(None)
+        future = request_alternate_builds(armor_config, self._catalog)
+        future.add_done_callback(lambda f: self._emit_alternate(armor_config, f))
+
+    # Runs on the worker thread (or right away if the build was already cached)
+    def _emit_alternate(self, armor_config: dict, future):
+        try:
+            results = future.result()
+        except Exception as e:
+            print(f"Failed to compute alternate build: {e}")
+            return
+        self.alternate_ready.emit(armor_config, results)
+
+    # Only show the alternate build if it belongs to the current armor config
+    def _on_alternate_ready(self, armor_config: dict, results: dict):
+        if armor_config is self._armor_config:
+            self.build_results_view.set_alternate_results(results)
+
     # Called when user finishes selecting their artifacts
-    def _on_artifact_selection_done(self, selected_artifacts: list[dict]):
+    def _on_artifact_selection_done(self, selected_artifacts: list[Artifact]):
         if self._armor_config is None:
             return
         # Pass the data (armor and selected artifacts) on to the artifact configuration screen
         self.artifact_config_view.set_context(self._armor_config, selected_artifacts)
         self.stack.setCurrentWidget(self.artifact_config_view)
 
-    # Run model and show build results
+    # Run model for every build type and show the one that was asked for
     def _on_artifact_config_done(self, payload: dict):
-        result = run_model(
+        from utils.abo_model import run_all_build_types
+        self._last_payload = payload
+        results = run_all_build_types(
             armor_config=payload["armor_config"],
             artifacts=payload["artifacts"],
-            build_type=payload["build_type"],
         )
-        self.build_results_view.set_context(result)
+        self.build_results_view.set_results(results, payload["build_type"])
         self.stack.setCurrentWidget(self.build_results_view)
 
+    # Builds for every slot / lead container upgrade with the same artifacts
+    def _on_sweep_requested(self, build_type: str):
+        if self._last_payload is None:
+            return
+        from utils.abo_model import run_slot_sweep
+        sweep = run_slot_sweep(
+            armor_config=self._last_payload["armor_config"],
+            artifacts=self._last_payload["artifacts"],
+            build_type=build_type,
+        )
+        self.build_results_view.set_sweep_results(build_type, sweep)
+
 
 def main():
     app = QApplication(sys.argv)
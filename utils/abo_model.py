@@ -1,7 +1,13 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, List
 from pathlib import Path
-import joblib
-from utils.stats import (ARTIFACT_BONUS, ARTIFACT_TO_ARMOR_STAT, armor_resistances, apply_artifact_resists,
+import numpy as np
+from data.catalog import Armor, Artifact, Catalog
+from utils.stats import (ARTIFACT_TO_ARMOR_STAT, BUILD_TYPES, armor_resistances, apply_artifact_resists,
     effective_resist_bars, compute_artifact_radiation_balance)
 
 # Build mapping:
@@ -13,111 +19,204 @@ for art_key, armor_key in ARTIFACT_TO_ARMOR_STAT.items():
         PROTECTION_KEYS.setdefault(armor_key, []).append(art_key)
 
 # ML model path / cache
-MODEL_PATH = Path(__file__).resolve().parent / "abo_ml_model.joblib"
+# The forest is stored as plain NumPy arrays (see ForestModel), so running it needs neither sklearn nor joblib
+MODEL_PATH = Path(__file__).resolve().parent / "abo_ml_model.npz"
 _ML_MODEL = None
 
-# Only load the model the first time the app is run. Prevents app from freezing if model is too large
-def _get_ml_model():
+
+class ForestModel:
+    """
+    A trained random forest regressor as flat arrays, every tree's nodes stored one after another:
+    feature / threshold: the split of every node (row[feature] <= threshold goes left)
+    left / right: child node indexes, leaves point at themselves so extra steps stay on the leaf
+    value: prediction of every node (only read at the leaves)
+    roots: first node of every tree, depth: longest root to leaf path
+    predict() walks every tree for every row at once, one array step per tree level.
+    """
+
+    ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+
+    def __init__(self, feature, threshold, left, right, value, roots, depth: int):
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int32)
+        self.right = np.asarray(right, dtype=np.int32)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.depth = int(depth)
+
+    @classmethod
+    def from_sklearn(cls, forest) -> "ForestModel":
+        # Flatten a fitted RandomForestRegressor (only reads its tree arrays, sklearn isn't imported)
+        feature, threshold, left, right, value, roots = [], [], [], [], [], []
+        offset = 0
+        depth = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            n = tree.node_count
+            is_leaf = tree.children_left == -1
+            own = np.arange(offset, offset + n)
+            roots.append(offset)
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            value.append(tree.value[:, 0, 0])
+            depth = max(depth, tree.max_depth)
+            offset += n
+        return cls(
+            np.concatenate(feature), np.concatenate(threshold), np.concatenate(left),
+            np.concatenate(right), np.concatenate(value), np.array(roots), depth,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ForestModel":
+        with np.load(path) as data:
+            return cls(*(data[name] for name in cls.ARRAYS), depth=int(data["depth"]))
+
+    def save(self, path: Path) -> None:
+        np.savez(path, depth=self.depth, **{name: getattr(self, name) for name in self.ARRAYS})
+
+    def predict(self, rows) -> np.ndarray:
+        # Same numbers as RandomForestRegressor.predict, which also compares in float32
+        X = np.asarray(rows, dtype=np.float32)
+        if len(X) == 0:
+            return np.zeros(0)
+        n_trees = len(self.roots)
+        # One walker per (row, tree), flattened so finished walkers can be dropped
+        nodes = np.tile(self.roots, len(X))
+        walker_rows = np.repeat(np.arange(len(X)), n_trees)
+        active = np.arange(len(nodes))
+        for _ in range(self.depth):
+            current = nodes[active]
+            go_left = X[walker_rows[active], self.feature[current]] <= self.threshold[current]
+            next_nodes = np.where(go_left, self.left[current], self.right[current])
+            nodes[active] = next_nodes
+            # Walkers that stayed put are on a leaf
+            active = active[next_nodes != current]
+            if len(active) == 0:
+                break
+        return self.value[nodes].reshape(len(X), n_trees).mean(axis=1)
+
+
+# Set once loading has finished, whether or not there was a model to load
+_ML_MODEL_READY = threading.Event()
+_ML_MODEL_LOCK = threading.Lock()
+
+def _load_ml_model_locked():
     global _ML_MODEL
-    if _ML_MODEL is not None:
+    if not _ML_MODEL_READY.is_set():
+        # Checks  if the file actually exists before trying to load
+        if MODEL_PATH.exists():
+            try:
+                _ML_MODEL = ForestModel.load(MODEL_PATH)
+            except Exception:
+                # If failure to load, fail silently
+                _ML_MODEL = None
+        _ML_MODEL_READY.set()
+    return _ML_MODEL
+
+def load_ml_model():
+    """
+    Loads the ML model (once), blocking until it is in.
+    The app calls this on a worker thread at startup so the first build doesn't have to wait for it.
+    Returns the model, or None if there is no trained model (the heuristic is then used alone)
+    """
+    with _ML_MODEL_LOCK:
+        return _load_ml_model_locked()
+
+# True once load_ml_model has finished
+def ml_model_ready() -> bool:
+    return _ML_MODEL_READY.is_set()
+
+# The model for scoring, never waits for it:
+# While another thread is still loading it, the builds use the heuristic alone.
+# If nothing started loading it (ex. scripts) it is loaded here.
+def _get_ml_model():
+    if _ML_MODEL_READY.is_set():
         return _ML_MODEL
-    # Checks  if the file actually exists before trying to load
-    if joblib is None or not MODEL_PATH.exists():
+    if not _ML_MODEL_LOCK.acquire(blocking=False):
         return None
     try:
-        _ML_MODEL = joblib.load(MODEL_PATH)
-    except Exception:
-        # If failure to load, fail silently
-        _ML_MODEL = None
-    return _ML_MODEL
+        return _load_ml_model_locked()
+    finally:
+        _ML_MODEL_LOCK.release()
 
 
-def _build_features_for_runtime(
-    armor_resists: Dict[str, float],
-    stats: Dict[str, Any],
-    build_type: str,
-) -> List[float]:
-    # 1.) Add the armor base stats
-    feats: List[float] = [
-        float(armor_resists.get("thermal", 0.0)),
-        float(armor_resists.get("electrical", 0.0)),
-        float(armor_resists.get("chemical", 0.0)),
-        float(armor_resists.get("radiation", 0.0)),
-        float(armor_resists.get("psi", 0.0)),
-        float(armor_resists.get("physical", 0.0)),
-    ]
+# ML features:
+# Every row is the armor resistances (RESIST_FEATURES), the artifact's stats (STAT_COLUMNS)
+# and the build type (one hot, in BUILD_TYPES order).
+# _feature_matrix is the only place rows are built, for the optimizer and for train_abo_model alike.
 
-    # Helper to safely get the numeric value from the stat name
-    def lvl(name: str) -> float:
-        try:
-            lvl_val = int(stats.get(name, 0))
-        except (TypeError, ValueError):
-            lvl_val = 0
-        return float(ARTIFACT_BONUS.get(lvl_val, 0))
-
-    # 2.) Add the artifact stats
-    feats.extend(
-        [
-            lvl("thermal_protection"),
-            lvl("electrical_protection"),
-            lvl("chemical_protection"),
-            lvl("physical_protection"),
-            lvl("endurance"),
-            lvl("increased_durability"),
-            lvl("bleeding_resistance"),
-            lvl("weight"),
-            lvl("radiation"),
-            lvl("radio_protection"),
-        ]
-    )
+# Armor resistance columns at the start of every ML feature row
+RESIST_FEATURES: List[str] = ["thermal", "electrical", "chemical", "radiation", "psi", "physical"]
+
+# Resistances in RESIST_FEATURES order
+def _resist_features(resists: Dict[str, float]) -> List[float]:
+    return [float(resists.get(r, 0.0)) for r in RESIST_FEATURES]
 
-    # One Hot Encode the desired build type
+def _feature_matrix(compiled: "CompiledArtifacts", rows: np.ndarray, armor_resists, build_type: str,) -> np.ndarray:
+    """
+    Feature rows for the given artifacts (rows of the compiled matrix).
+    armor_resists is a resist dict shared by every row,
+    or an array with one RESIST_FEATURES row per artifact row (ex. resistances part way through a build)
+    """
     bt = (build_type or "").lower()
-    feats.extend(
-        [
-            1.0 if bt == "balanced" else 0.0,
-            1.0 if bt == "anomaly protections" else 0.0,
-            1.0 if bt == "endurance" else 0.0,
-            1.0 if bt == "bleed resistance" else 0.0,
-        ]
-    )
+    one_hot = [1.0 if bt == name.lower() else 0.0 for name in BUILD_TYPES]
+    if isinstance(armor_resists, dict):
+        armor_resists = _resist_features(armor_resists)
 
+    n_resists = len(RESIST_FEATURES)
+    n_stats = len(STAT_COLUMNS)
+    feats = np.empty((len(rows), n_resists + n_stats + len(one_hot)))
+    feats[:, :n_resists] = armor_resists
+    feats[:, n_resists:n_resists + n_stats] = compiled.bonus[rows]
+    feats[:, n_resists + n_stats:] = one_hot
     return feats
 
-def _ml_score_artifact_for_build(
-    artifact: Dict,
-    armor_resists: Dict[str, float],
-    build_type: str,
-) -> float | None:
-    # Asks the model to predict how good this artifact is
+# Asks the model to score a whole feature matrix with a single predict call
+def _ml_predict(feats: np.ndarray) -> np.ndarray | None:
     model = _get_ml_model()
-    if model is None:
+    if model is None or len(feats) == 0:
         return None
-
-    stats = artifact.get("stats", {}) or {}
-    feats = _build_features_for_runtime(armor_resists, stats, build_type)
     try:
-        # 0 is used because predict returns a list, but we are only sending 1 item
-        pred = model.predict([feats])[0]
-        return float(pred)
+        return np.asarray(model.predict(feats), dtype=float)
     except Exception:
         return None
 
-# Convert artifact level into numeric value
-def _level_value(level: Any) -> float:
-    try:
-        lvl = int(level)
-    except (TypeError, ValueError):
-        return 0.0
-    return float(ARTIFACT_BONUS.get(lvl, 0))
+def _ml_score_artifacts_for_build(
+    artifacts: List[Artifact],
+    armor_resists: Dict[str, float],
+    build_type: str,
+) -> List[float] | None:
+    # Asks the model to predict how good every artifact is with a single predict call
+    if _get_ml_model() is None or not artifacts:
+        return None
+    compiled = CompiledArtifacts(artifacts)
+    preds = _ml_predict(_feature_matrix(compiled, np.arange(len(compiled)), armor_resists, build_type))
+    if preds is None:
+        return None
+    return [float(p) for p in preds]
+
+def _ml_score_artifact_for_build(
+    artifact: Artifact,
+    armor_resists: Dict[str, float],
+    build_type: str,
+) -> float | None:
+    # Single artifact version, kept for callers that only need one prediction
+    preds = _ml_score_artifacts_for_build([artifact], armor_resists, build_type)
+    if preds is None:
+        return None
+    # 0 is used because we are only sending 1 item
+    return preds[0]
 
 # Return armor resistances as floats
-def _armor_resists(armor: Dict) -> Dict[str, float]:
+def _armor_resists(armor: Armor) -> Dict[str, float]:
     base = armor_resistances(armor)
     return {k: float(v) for k, v in base.items()}
 
 
-def _protection_score(stats: Dict[str, Any], armor_resists: Dict[str, float]) -> float:
+def _protection_score(bonus: Dict[str, int], armor_resists: Dict[str, float]) -> float:
     """
     Calculates the protection score based on armor_resists
     Whatever protection is the lowest,
@@ -134,91 +233,100 @@ def _protection_score(stats: Dict[str, Any], armor_resists: Dict[str, float]) ->
 
         value = 0.0
         for k in art_keys:
-            value = max(value, _level_value(stats.get(k, 0)))
+            value = max(value, float(bonus.get(k, 0)))
 
         score += value * importance
 
     return score
 
 # Score endurance stat
-def _endurance_score(stats: Dict[str, Any]) -> float:
-    return _level_value(stats.get("endurance", 0))
+def _endurance_score(bonus: Dict[str, int]) -> float:
+    return float(bonus.get("endurance", 0))
 
 # Score increased durability stat
-def _durability_score(stats: Dict[str, Any]) -> float:
-    return _level_value(stats.get("increased_durability", 0))
+def _durability_score(bonus: Dict[str, int]) -> float:
+    return float(bonus.get("increased_durability", 0))
 
 # Score bleeding resistance stat
-def _bleed_score(stats: Dict[str, Any]) -> float:
-    return _level_value(stats.get("bleeding_resistance", 0))
+def _bleed_score(bonus: Dict[str, int]) -> float:
+    return float(bonus.get("bleeding_resistance", 0))
 
 # Score weight stat
-def _weight_score(stats: Dict[str, Any]) -> float:
-    return _level_value(stats.get("weight", 0))
+def _weight_score(bonus: Dict[str, int]) -> float:
+    return float(bonus.get("weight", 0))
 
 # Radiation penalty after radio protection (0 or negative is good)
-def _radiation_penalty(stats: Dict[str, Any]) -> float:
-    lvl_rad = int(stats.get("radiation", 0))
-    lvl_radio = int(stats.get("radio_protection", 0))
+def _radiation_penalty(bonus: Dict[str, int]) -> float:
+    return max(0.0, float(bonus.get("radiation", 0) - bonus.get("radio_protection", 0)))
+
 
-    rad_val = ARTIFACT_BONUS.get(lvl_rad, 0)
-    radio_val = ARTIFACT_BONUS.get(lvl_radio, 0)
+# Weight (multiplier) of every score component per build type
+# radiation_penalty is subtracted from the score
+BUILD_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "anomaly protections": {
+        "protection": 2.5,
+        "endurance": 0.25,
+        "durability": 0.25,
+        "bleed": 0.0,
+        "weight": 0.25,
+        "radiation_penalty": 0.7,
+    },
+    "endurance": {
+        "protection": 0.8,
+        "endurance": 2.0,
+        "durability": 1.2,
+        "bleed": 0.0,
+        "weight": 0.7,
+        "radiation_penalty": 0.7,
+    },
+    "bleed resistance": {
+        "protection": 0.8,
+        "endurance": 0.5,
+        "durability": 0.5,
+        "bleed": 2.0,
+        "weight": 0.7,
+        "radiation_penalty": 0.7,
+    },
+    "balanced": {
+        "protection": 1.3,
+        "endurance": 1.2,
+        "durability": 1.0,
+        "bleed": 1.0,
+        "weight": 1.0,
+        "radiation_penalty": 0.8,
+    },
+}
 
-    return max(0.0, float(rad_val - radio_val))
+# Unknown build types fall back to the balanced weights
+def _build_weights(build_type: str) -> Dict[str, float]:
+    return BUILD_WEIGHTS.get((build_type or "").lower(), BUILD_WEIGHTS["balanced"])
 
 
-def _score_artifact_for_build(artifact: Dict, armor_resists: Dict[str, float], build_type: str,) -> Dict[str, float]:
+def _score_artifact_for_build(artifact: Artifact, armor_resists: Dict[str, float], build_type: str,) -> Dict[str, float]:
     """
     Heuristic Function:
     Assigns weights (multipliers) to the different stas based on what the user asked for their build.
     Ex: If user wanted an 'Endurance' build, the endurance stat gets a score of 2.0
     """
-    stats = artifact.get("stats", {}) or {}
+    bonus = artifact.bonus
 
-    prot = _protection_score(stats, armor_resists)
-    endur = _endurance_score(stats)
-    dura = _durability_score(stats)
-    bleed = _bleed_score(stats)
-    weight = _weight_score(stats)
-    rad_pen = _radiation_penalty(stats)
+    prot = _protection_score(bonus, armor_resists)
+    endur = _endurance_score(bonus)
+    dura = _durability_score(bonus)
+    bleed = _bleed_score(bonus)
+    weight = _weight_score(bonus)
+    rad_pen = _radiation_penalty(bonus)
 
-    bt = build_type.lower()
     # Define the weights based on the build type selection
-    if bt == "anomaly protections":
-        score = (
-            2.5 * prot
-            + 0.25 * endur
-            + 0.25 * dura
-            + 0.25 * weight
-            - 0.7 * rad_pen
-        )
-    elif bt == "endurance":
-        score = (
-            0.8 * prot
-            + 2.0 * endur
-            + 1.2 * dura
-            + 0.7 * weight
-            - 0.7 * rad_pen
-        )
-    elif bt == "bleed resistance":
-        score = (
-            0.8 * prot
-            + 0.5 * endur
-            + 0.5 * dura
-            + 0.7 * weight
-            + 2.0 * bleed
-            - 0.7 * rad_pen
-        )
-    else:
-        # Balanced build choice weights
-        score = (
-            1.3 * prot
-            + 1.2 * endur
-            + 1.0 * dura
-            + 1.0 * bleed
-            + 1.0 * weight
-            - 0.8 * rad_pen
-        )
+    w = _build_weights(build_type)
+    score = (
+        w["protection"] * prot
+        + w["endurance"] * endur
+        + w["durability"] * dura
+        + w["bleed"] * bleed
+        + w["weight"] * weight
+        - w["radiation_penalty"] * rad_pen
+    )
     # Return breakdown of scores for debugging
     return {
         "score": score,
@@ -230,72 +338,475 @@ def _score_artifact_for_build(artifact: Dict, armor_resists: Dict[str, float], b
         "radiation_penalty": rad_pen,
     }
 
-def _choose_artifacts(armor: Dict, artifacts: List[Dict], slots: int, lead_slots: int, build_type: str,) -> List[Dict]:
+# Stat matrix:
+# The selected artifacts are turned into numbers once per run_model call,
+# so every slot round only needs a few array operations instead of walking the stat dicts
+
+# Artifact stat columns (same order as the artifact part of the ML features)
+STAT_COLUMNS: List[str] = [
+    "thermal_protection",
+    "electrical_protection",
+    "chemical_protection",
+    "physical_protection",
+    "endurance",
+    "increased_durability",
+    "bleeding_resistance",
+    "weight",
+    "radiation",
+    "radio_protection",
+]
+_STAT_INDEX: Dict[str, int] = {name: i for i, name in enumerate(STAT_COLUMNS)}
+
+# Stat columns that feed each resist type in PROTECTION_KEYS
+_PROTECTION_COLUMNS: List[List[int]] = [
+    [_STAT_INDEX[k] for k in art_keys] for art_keys in PROTECTION_KEYS.values()
+]
+
+# Score components in the order used by the weight vector
+COMPONENT_NAMES: List[str] = [
+    "protection_score",
+    "endurance_score",
+    "durability_score",
+    "bleed_score",
+    "weight_score",
+    "radiation_penalty",
+]
+
+
+class CompiledArtifacts:
+    """
+    Dense version of an artifact list:
+    bonus holds the ARTIFACT_BONUS value of every stat (N x STAT_COLUMNS)
+    protection holds the best protection value per resist type (N x PROTECTION_KEYS)
+    static holds every component except protection (N x COMPONENT_NAMES, protection column is 0)
+    psi holds the psi bonus, it isn't scored but still shows up in the final resistances
+    """
+
+    def __init__(self, artifacts: List[Artifact]):
+        self.artifacts = list(artifacts)
+
+        # Bonus values were resolved when the catalog was loaded, this only lays them out
+        n = len(self.artifacts)
+        self.bonus = np.zeros((n, len(STAT_COLUMNS)))
+        self.psi = np.zeros(n)
+        for i, art in enumerate(self.artifacts):
+            for name, value in art.bonus.items():
+                j = _STAT_INDEX.get(name)
+                if j is not None:
+                    self.bonus[i, j] = value
+            self.psi[i] = art.bonus.get("psi", 0)
+
+        self.protection = np.zeros((n, len(_PROTECTION_COLUMNS)))
+        for r, cols in enumerate(_PROTECTION_COLUMNS):
+            self.protection[:, r] = self.bonus[:, cols].max(axis=1) if n else 0.0
+
+        col = _STAT_INDEX
+        self.static = np.zeros((n, len(COMPONENT_NAMES)))
+        self.static[:, 1] = self.bonus[:, col["endurance"]]
+        self.static[:, 2] = self.bonus[:, col["increased_durability"]]
+        self.static[:, 3] = self.bonus[:, col["bleeding_resistance"]]
+        self.static[:, 4] = self.bonus[:, col["weight"]]
+        self.static[:, 5] = np.maximum(0.0, self.bonus[:, col["radiation"]] - self.bonus[:, col["radio_protection"]])
+
+        # Weighted static score per build type, filled on first use
+        self._static_scores: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.artifacts)
+
+    # Compiled rows for a subset of the artifacts, without parsing the stats again
+    def subset(self, rows: np.ndarray) -> "CompiledArtifacts":
+        part = CompiledArtifacts.__new__(CompiledArtifacts)
+        part.artifacts = [self.artifacts[i] for i in rows]
+        part.bonus = self.bonus[rows]
+        part.psi = self.psi[rows]
+        part.protection = self.protection[rows]
+        part.static = self.static[rows]
+        part._static_scores = {key: scores[rows] for key, scores in self._static_scores.items()}
+        return part
+
+    # Weighted score of everything except protection, computed once per build type
+    def static_scores(self, build_type: str) -> np.ndarray:
+        key = (build_type or "").lower()
+        if key not in BUILD_WEIGHTS:
+            key = "balanced"
+        cached = self._static_scores.get(key)
+        if cached is None:
+            cached = self.static @ _weight_vector(key)
+            self._static_scores[key] = cached
+        return cached
+
+
+# Dominance pruning:
+# An artifact is dominated when another one is at least as good in every stat the scoring rewards
+# (plus psi and radio protection, so the shown resistances and radiation never get worse)
+# and has at most the same radiation.
+# If an artifact has at least as many dominators as there are slots, a build can always swap it
+# for an unused dominator without losing score, so it is never needed.
+# Identical artifacts count the earlier one as the dominator, so duplicates aren't all removed.
+
+# Rows compared per block, keeps the pairwise comparison small for big inventories
+_DOMINANCE_BLOCK = 256
+
+# Stats where higher is better, radiation is negated so the same >= check works
+def _dominance_matrix(compiled: CompiledArtifacts) -> np.ndarray:
+    col = _STAT_INDEX
+    better = [
+        col["thermal_protection"],
+        col["electrical_protection"],
+        col["chemical_protection"],
+        col["physical_protection"],
+        col["endurance"],
+        col["increased_durability"],
+        col["bleeding_resistance"],
+        col["weight"],
+        col["radio_protection"],
+    ]
+    return np.column_stack([
+        compiled.bonus[:, better],
+        compiled.psi,
+        -compiled.bonus[:, col["radiation"]],
+    ])
+
+def prune_dominated(compiled: CompiledArtifacts, slots: int) -> tuple:
+    """
+    Removes artifacts that can never be part of a best build with this many slots.
+    Returns the pruned CompiledArtifacts and how many candidates were removed
+    """
+    n = len(compiled)
+    if n == 0 or slots <= 0:
+        return compiled, 0
+
+    stats = _dominance_matrix(compiled)
+    index = np.arange(n)
+    dominators = np.zeros(n, dtype=int)
+
+    for start in range(0, n, _DOMINANCE_BLOCK):
+        block = stats[start:start + _DOMINANCE_BLOCK]
+        # ge[i, j]: artifact start + i is at least as good as artifact j everywhere
+        ge = np.all(block[:, None, :] >= stats[None, :, :], axis=2)
+        same = np.all(block[:, None, :] == stats[None, :, :], axis=2)
+        earlier = index[start:start + len(block), None] < index[None, :]
+        dominators += (ge & (~same | earlier)).sum(axis=0)
+
+    keep = np.flatnonzero(dominators < slots)
+    removed = n - len(keep)
+    if removed == 0:
+        return compiled, 0
+    return compiled.subset(keep), removed
+
+
+# Build type weights as a vector matching COMPONENT_NAMES (radiation penalty is negative)
+def _weight_vector(build_type: str) -> np.ndarray:
+    w = _build_weights(build_type)
+    return np.array([
+        w["protection"],
+        w["endurance"],
+        w["durability"],
+        w["bleed"],
+        w["weight"],
+        -w["radiation_penalty"],
+    ])
+
+# Resist values in PROTECTION_KEYS order
+def _resist_vector(resists: Dict[str, float]) -> np.ndarray:
+    return np.array([float(resists.get(r, 0.0)) for r in PROTECTION_KEYS])
+
+# Same multiplier as _protection_score (1.0 if full, up to 3.0 if empty) for every resist type
+def _importance_vector(resists: Dict[str, float]) -> np.ndarray:
+    return 1.0 + np.maximum(0.0, 100.0 - _resist_vector(resists)) / 50.0
+
+# RESIST_FEATURES columns in PROTECTION_KEYS order
+_PROTECTION_FEATURES: List[int] = [RESIST_FEATURES.index(r) for r in PROTECTION_KEYS]
+
+# Score components of the given rows against the current resistances (rows x COMPONENT_NAMES)
+# resists is a dict shared by every row, or one RESIST_FEATURES row per row like _feature_matrix takes
+def _score_components(compiled: CompiledArtifacts, rows: np.ndarray, resists) -> np.ndarray:
+    comps = compiled.static[rows].copy()
+    if isinstance(resists, dict):
+        comps[:, 0] = compiled.protection[rows] @ _importance_vector(resists)
+    else:
+        importance = 1.0 + np.maximum(0.0, 100.0 - np.asarray(resists)[:, _PROTECTION_FEATURES]) / 50.0
+        comps[:, 0] = (compiled.protection[rows] * importance).sum(axis=1)
+    return comps
+
+# Same breakdown dict _score_artifact_for_build returns, built from one row of components
+def _score_breakdown(score: float, comps: np.ndarray, artifact: Artifact) -> Dict:
+    item: Dict[str, Any] = {"score": float(score)}
+    for name, value in zip(COMPONENT_NAMES, comps):
+        item[name] = float(value)
+    item["artifact"] = artifact
+    item["in_lead_container"] = False
+    return item
+
+
+# Lead containers:
+# An artifact in a lead container still gives its stats but its radiation penalty is cancelled.
+# For any set of artifacts the best placement is the biggest penalties in the containers,
+# so the optimizers only need to track which penalties are currently contained.
+
+# Radiation penalty a lead container would cancel for every row, given the penalties already contained
+def _container_relief(penalties: np.ndarray, contained: tuple, lead_slots: int) -> np.ndarray:
+    if lead_slots <= 0:
+        return np.zeros_like(penalties)
+    if len(contained) < lead_slots:
+        return penalties
+    # Containers are full, the artifact can only take the place of the weakest one
+    return np.maximum(0.0, penalties - contained[0])
+
+# Contained penalties after adding one artifact (ascending, so the weakest one is first)
+def _contain(contained: tuple, penalty: float, lead_slots: int) -> tuple:
+    if lead_slots <= 0 or penalty <= 0.0:
+        return contained
+    return tuple(sorted(contained + (float(penalty),))[-lead_slots:])
+
+
+def _choose_artifacts(armor: Armor, artifacts: List[Artifact], slots: int, lead_slots: int, build_type: str,
+    compiled: CompiledArtifacts | None = None,) -> List[Dict]:
     """
     Greedy selection:
     1.) We look at empty slots
     2.) For the current selected slot we test all the artifacts selected
     3.) We pick the artifact that gives the highest boost
     4.) We add the stats, update the stats, and repeat for the next slot
+    Artifacts that would go in a free lead container don't pay their radiation penalty
+    Pass compiled to reuse the stat matrix of an earlier run on the same artifacts
     """
-    if slots <= 0 or not artifacts:
+    if compiled is None:
+        compiled = CompiledArtifacts(artifacts)
+    chosen = _greedy_picks(armor, compiled, slots, lead_slots, build_type)
+    _assign_lead_containers(chosen, lead_slots)
+    return chosen
+
+# Greedy picks in the order they were made, before lead containers are assigned
+# A round never looks at how many slots are left, so the first n picks are the greedy build for n slots
+# use_ml=False scores with the heuristic alone (train_abo_model replays these builds for its training data)
+def _greedy_picks(armor: Armor, compiled: CompiledArtifacts, slots: int, lead_slots: int, build_type: str,
+    use_ml: bool = True,) -> List[Dict]:
+    if slots <= 0 or len(compiled) == 0:
         return []
 
+    weights = _weight_vector(build_type)
+    w_prot = weights[0]
+    w_rad = -weights[5]
+    penalties = compiled.static[:, 5]
+    contained: tuple = ()
+
     # Start from base armor resistances
     current_resists = _armor_resists(armor)
-    remaining = list(artifacts)
+    remaining = list(range(len(compiled)))
     chosen: List[Dict] = []
 
+    # Only protection depends on the current resistances.
+    # Everything else is scored once here and reused in every round
+    static_scores = compiled.static_scores(build_type)
+    importance = _importance_vector(current_resists)
+    prot_scores = compiled.protection @ importance
+
+    # Decided once, so a model that finishes loading mid-build doesn't change how the later rounds are scored
+    use_ml = use_ml and _get_ml_model() is not None
+
     # Loop once for every slot we have available
     for _ in range(min(slots, len(remaining))):
-        best_item: Dict | None = None
-        best_art: Dict | None = None
-        # Starting with negative infinity so any score beats it
-        best_score = float("-inf")
-
-        # Test every remaining artifact
-        for art in remaining:
-            # Get the heuristic score
-            scores = _score_artifact_for_build(art, current_resists, build_type)
-
-            # Looks at ML selection versus heuristic selection, doesn't completely replace heuristic selection
-            ml_val = _ml_score_artifact_for_build(art, current_resists, build_type)
-            if ml_val is not None:
-                base = scores["score"]
-                scores["score"] = 0.8 * base + 0.2 * ml_val
-
-            scores["artifact"] = art
-            scores["in_lead_container"] = False
-
-            # Is this the best artifact we have seen in the loop?
-            if scores["score"] > best_score:
-                best_score = scores["score"]
-                best_item = scores
-                best_art = art
-
-        # If nothing better is seen, stop the loop
-        if best_item is None or best_art is None:
-            break
+        rows = np.array(remaining)
+
+        # Score every remaining artifact at once
+        scores = w_prot * prot_scores[rows] + static_scores[rows]
+        scores = scores + w_rad * _container_relief(penalties[rows], contained, lead_slots)
+
+        # Looks at ML selection versus heuristic selection, doesn't completely replace heuristic selection
+        # The whole round is scored with one model call instead of one per artifact
+        ml_vals = _ml_predict(_feature_matrix(compiled, rows, current_resists, build_type)) if use_ml else None
+        if ml_vals is not None:
+            scores = 0.8 * scores + 0.2 * ml_vals
+
+        # argmax keeps the first artifact on ties, same as the old strict > check
+        best = int(np.argmax(scores))
+        best_row = remaining[best]
+        best_art = compiled.artifacts[best_row]
 
         # Lock in the choice for that slot
-        chosen.append(best_item)
-        remaining.remove(best_art)
+        comps = compiled.static[best_row].copy()
+        comps[0] = prot_scores[best_row]
+        chosen.append(_score_breakdown(scores[best], comps, best_art))
+        remaining.pop(best)
+        contained = _contain(contained, penalties[best_row], lead_slots)
 
         # Update current resistances based on the newly chosen artifact
         current_resists = apply_artifact_resists(current_resists, [best_art])
 
-    # Sort the chosen artifacts by which has the highest Radiation stat
-    # Highest Radiation Stat artifacts get placed in the lead containers
+        # Only the resist types this artifact touched change importance, so only those columns are rescored
+        touched = np.flatnonzero(compiled.protection[best_row] > 0.0)
+        if len(touched):
+            new_importance = _importance_vector(current_resists)
+            prot_scores = prot_scores + compiled.protection[:, touched] @ (new_importance[touched] - importance[touched])
+            importance = new_importance
+
+    return chosen
+
+# Sort the chosen artifacts by which has the highest Radiation stat
+# Highest Radiation Stat artifacts get placed in the lead containers
+# Artifacts without a penalty stay out, a container would only hide their radio protection
+def _assign_lead_containers(chosen: List[Dict], lead_slots: int) -> None:
     if lead_slots > 0 and chosen:
         by_rad = sorted(chosen, key=lambda x: x["radiation_penalty"], reverse=True)
         for i, item in enumerate(by_rad):
-            if i < lead_slots:
+            if i < lead_slots and item["radiation_penalty"] > 0.0:
                 item["in_lead_container"] = True
 
+
+# Exact solver:
+# Scores a whole set of artifacts at once so the order they are picked in doesn't matter.
+# Protection is worth the area under the importance curve used by _protection_score,
+# so stacking the same resistance has diminishing returns just like in the greedy loop.
+
+# Upper limit on search nodes so huge inventories can't freeze the app.
+# If the limit is hit, the best build found so far is returned (never worse than the greedy seed)
+EXACT_NODE_LIMIT = 20000
+
+# Floating point slack so equal scores don't count as improvements
+_EXACT_EPS = 1e-9
+
+# Area under the importance curve (1.0 + missing / 50.0) when a resist goes from base to base + value
+# Works on floats and on numpy arrays
+def _protection_gain(base, value):
+    before = np.maximum(0.0, 100.0 - base)
+    after = np.maximum(0.0, 100.0 - (base + value))
+    return value + (before * before - after * after) / 100.0
+
+def _choose_artifacts_exact(armor: Armor, artifacts: List[Artifact], slots: int, lead_slots: int, build_type: str,
+    compiled: CompiledArtifacts | None = None, node_limit: int = EXACT_NODE_LIMIT,) -> List[Dict]:
+    """
+    Branch and bound selection:
+    1.) Every artifact gets a ceiling (the most it could ever add to a build)
+    2.) Artifacts are sorted by ceiling so the best candidates are tried first
+    3.) A greedy pass gives a starting build to beat
+    4.) Any branch whose best possible finish can't beat the current best build is skipped
+    Lead container placement is part of the score, so radiation affects which artifacts get picked
+    """
+    if compiled is None:
+        compiled = CompiledArtifacts(artifacts)
+    max_picks = min(slots, len(compiled))
+    if max_picks <= 0:
+        return []
+
+    weights = _weight_vector(build_type)
+    w_prot = weights[0]
+    w_rad = -weights[5]
+    base_resists = _armor_resists(armor)
+    bases = _resist_vector(base_resists)
+
+    # Ceiling = static score + protection gain on the bare armor + a free lead container (the most it can ever add)
+    static_all = compiled.static_scores(build_type)
+    ceiling_all = (
+        static_all
+        + w_prot * _protection_gain(bases, compiled.protection).sum(axis=1)
+        + w_rad * _container_relief(compiled.static[:, 5], (), lead_slots)
+    )
+
+    # An artifact that can't add anything even to an empty build is never worth a slot
+    keep = np.flatnonzero(ceiling_all > _EXACT_EPS)
+    order = keep[np.argsort(-ceiling_all[keep], kind="stable")]
+    n = len(order)
+    if n == 0:
+        return []
+
+    static = static_all[order]
+    protection = compiled.protection[order]
+    penalties = compiled.static[order, 5]
+    ceiling = ceiling_all[order]
+
+    # prefix[i] = sum of the first i ceilings, used for the cheap bound
+    prefix = np.concatenate(([0.0], np.cumsum(ceiling))).tolist()
+
+    # How much every candidate from start onwards adds given the resist totals and contained penalties of the build
+    def marginals(start: int, totals: np.ndarray, contained: tuple) -> np.ndarray:
+        gains = _protection_gain(bases + totals, protection[start:])
+        relief = _container_relief(penalties[start:], contained, lead_slots)
+        return static[start:] + w_prot * gains.sum(axis=1) + w_rad * relief
+
+    # Greedy seed so the search starts with a good build to beat
+    totals = np.zeros(len(bases))
+    contained: tuple = ()
+    available = np.ones(n, dtype=bool)
+    seed: List[int] = []
+    seed_value = 0.0
+    for _ in range(max_picks):
+        gains = np.where(available, marginals(0, totals, contained), -np.inf)
+        idx = int(np.argmax(gains))
+        if gains[idx] <= _EXACT_EPS:
+            break
+        seed.append(idx)
+        seed_value += float(gains[idx])
+        available[idx] = False
+        totals = totals + protection[idx]
+        contained = _contain(contained, penalties[idx], lead_slots)
+
+    best = {"value": seed_value, "picks": sorted(seed)}
+    picks: List[int] = []
+    nodes = 0
+
+    def search(start: int, value: float, totals: np.ndarray, contained: tuple) -> None:
+        nonlocal nodes
+        nodes += 1
+        if value > best["value"] + _EXACT_EPS:
+            best["value"] = value
+            best["picks"] = list(picks)
+
+        left = max_picks - len(picks)
+        if left == 0 or start >= n or nodes > node_limit:
+            return
+
+        # Cheap bound: the next ceilings in sorted order are the biggest ones left
+        if value + prefix[min(n, start + left)] - prefix[start] <= best["value"] + _EXACT_EPS:
+            return
+
+        # Tight bound: marginals can only shrink as the build grows, so the best ones right now bound the rest
+        gains = marginals(start, totals, contained)
+        positive = gains[gains > 0.0]
+        if len(positive) > left:
+            positive = np.partition(positive, len(positive) - left)[-left:]
+        if value + float(positive.sum()) <= best["value"] + _EXACT_EPS:
+            return
+
+        for idx in range(start, n):
+            if value + prefix[min(n, idx + left)] - prefix[idx] <= best["value"] + _EXACT_EPS:
+                # Ceilings are sorted so no later artifact can do better either
+                break
+            gain = float(gains[idx - start])
+            if gain <= _EXACT_EPS:
+                continue
+
+            picks.append(idx)
+            search(idx + 1, value + gain, totals + protection[idx], _contain(contained, penalties[idx], lead_slots))
+            picks.pop()
+
+            if nodes > node_limit:
+                return
+
+    search(0, 0.0, np.zeros(len(bases)), ())
+
+    # Rebuild the same per-slot breakdown the greedy loop produces
+    current_resists = dict(base_resists)
+    chosen: List[Dict] = []
+    for idx in best["picks"]:
+        row = int(order[idx])
+        comps = _score_components(compiled, np.array([row]), current_resists)[0]
+        art = compiled.artifacts[row]
+        chosen.append(_score_breakdown(comps @ weights, comps, art))
+        current_resists = apply_artifact_resists(current_resists, [art])
+
+    _assign_lead_containers(chosen, lead_slots)
     return chosen
 
+# Optimizer engines that run_model can use
+ENGINES = {
+    "greedy": _choose_artifacts,
+    "exact": _choose_artifacts_exact,
+}
+
 # Compute final numeric resistances
-def _final_resistances(armor: Dict, chosen: List[Dict]) -> Dict[str, int]:
+def _final_resistances(armor: Armor, chosen: List[Dict]) -> Dict[str, int]:
     art_list = [item["artifact"] for item in chosen]
     return apply_artifact_resists(armor_resistances(armor), art_list)
 
@@ -306,26 +817,171 @@ def _radiation_balance_nonlead(chosen: List[Dict]) -> int:
         return 0
     return compute_artifact_radiation_balance(non_lead)
 
-def run_model(
-    armor_config: Dict,
-    artifacts: List[Dict],
-    build_type: str,
-) -> Dict[str, Any]:
-    # Run optimizer for the selected build
-    armor = armor_config.get("armor", {})
+# Result cache:
+# Users flip between the results and the artifact config screens a lot, usually only changing
+# the build type or one artifact, so finished builds are kept in a small LRU cache
+
+RESULT_CACHE_SIZE = 256
+
+
+class ResultCache:
+    """
+    Bounded LRU cache of run_model results with hit/miss counters.
+    The least recently used build is dropped once maxsize is reached.
+    Safe to use from the background alternate build worker.
+    """
+
+    def __init__(self, maxsize: int = RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Dict[str, Any] | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: tuple, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+RESULT_CACHE = ResultCache()
+
+# Hit/miss counters and size of the run_model cache
+def run_model_cache_info() -> Dict[str, int]:
+    return RESULT_CACHE.info()
+
+def clear_run_model_cache() -> None:
+    RESULT_CACHE.clear()
+
+# Armor identity: id plus base resistances, so edited armor data never reuses a stale build
+def _armor_fingerprint(armor: Armor) -> tuple:
+    return (armor.id, tuple(sorted(armor.resistances.items())))
+
+# Order independent fingerprint of the artifact selection (id + stats of every artifact)
+def _artifact_fingerprint(artifacts: List[Artifact]) -> str:
+    entries = sorted(
+        json.dumps([art.id, art.bonus], sort_keys=True)
+        for art in artifacts
+    )
+    digest = hashlib.sha1()
+    for entry in entries:
+        digest.update(entry.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+# Copy the parts of a result the views could change so cached builds stay untouched
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    copied = dict(result)
+    copied["chosen_artifacts"] = [dict(item) for item in result["chosen_artifacts"]]
+    copied["final_resistances"] = dict(result["final_resistances"])
+    copied["final_resistance_bars"] = dict(result["final_resistance_bars"])
+    return copied
+
+# Look up the optimizer for an engine name
+def _resolve_engine(engine: str):
+    engine_name = (engine or "greedy").lower()
+    choose = ENGINES.get(engine_name)
+    if choose is None:
+        raise ValueError(f"Unknown optimizer engine: {engine!r} (expected one of {', '.join(ENGINES)})")
+    return engine_name, choose
+
+# Armor, artifact slots and lead containers from the armor config screen
+def _parse_armor_config(armor_config: Dict) -> tuple:
+    armor = armor_config.get("armor")
     slots = int(armor_config.get("slots_selected", 0))
     lead_slots = int(armor_config.get("lead_containers_selected", 0))
+    return armor, slots, lead_slots
 
+def _run_build(
+    armor: Armor,
+    slots: int,
+    lead_slots: int,
+    artifacts: List[Artifact],
+    build_type: str,
+    engine: str,
+    use_cache: bool,
+    compiled: CompiledArtifacts | None = None,
+    fingerprint: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Runs one build through the cache.
+    compiled and fingerprint can be shared between runs on the same artifacts
+    """
+    engine_name, choose = _resolve_engine(engine)
     build_type_clean = (build_type or "Balanced").strip()
 
-    chosen = _choose_artifacts(
+    # Repeat requests come straight from the cache
+    cache_key = None
+    if use_cache:
+        cache_key = _cache_key(armor, slots, lead_slots, build_type_clean, engine_name,
+            fingerprint or _artifact_fingerprint(artifacts))
+        cached = RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            result = _copy_result(cached)
+            result["build_type"] = build_type_clean
+            return result
+
+    if compiled is None:
+        compiled = CompiledArtifacts(artifacts)
+    candidates, removed = prune_dominated(compiled, slots)
+
+    chosen = choose(
         armor=armor,
-        artifacts=artifacts,
+        artifacts=candidates.artifacts,
         slots=slots,
         lead_slots=lead_slots,
         build_type=build_type_clean,
+        compiled=candidates,
+    )
+
+    result = _build_result(armor, slots, lead_slots, build_type_clean, chosen, removed)
+    if cache_key is not None:
+        RESULT_CACHE.put(cache_key, _copy_result(result))
+    return result
+
+# The greedy engine blends in the ML model, so whether it is loaded is part of the key
+def _cache_key(armor: Armor, slots: int, lead_slots: int, build_type: str, engine_name: str, fingerprint: str) -> tuple:
+    ml_ready = engine_name == "greedy" and _get_ml_model() is not None
+    return (
+        _armor_fingerprint(armor),
+        slots,
+        lead_slots,
+        build_type.lower(),
+        engine_name,
+        ml_ready,
+        fingerprint,
     )
 
+# Final resistances and radiation of the chosen artifacts, in the format the results view reads
+def _build_result(armor: Armor, slots: int, lead_slots: int, build_type: str, chosen: List[Dict],
+    dominated_removed: int = 0,) -> Dict[str, Any]:
     final_resists = _final_resistances(armor, chosen)
     final_resist_bars = effective_resist_bars(
         armor,
@@ -337,9 +993,200 @@ def run_model(
         "armor": armor,
         "slots": slots,
         "lead_containers": lead_slots,
-        "build_type": build_type_clean,
+        "build_type": build_type,
         "chosen_artifacts": chosen,
         "final_resistances": final_resists,
         "final_resistance_bars": final_resist_bars,
         "radiation_balance": rad_balance,
-    }
\ No newline at end of file
+        # How many dominated artifacts were skipped before the search
+        "dominated_removed": dominated_removed,
+    }
+
+def run_model(
+    armor_config: Dict,
+    artifacts: List[Artifact],
+    build_type: str,
+    engine: str = "greedy",
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    # Run optimizer for the selected build
+    # engine="greedy" is the fast default, engine="exact" searches for the best set of artifacts
+    armor, slots, lead_slots = _parse_armor_config(armor_config)
+    return _run_build(armor, slots, lead_slots, artifacts, build_type, engine, use_cache)
+
+def run_all_build_types(
+    armor_config: Dict,
+    artifacts: List[Artifact],
+    engine: str = "greedy",
+    use_cache: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the optimizer for every build type in BUILD_TYPES.
+    The artifacts are compiled and fingerprinted once and shared by all the runs,
+    so the results view can switch between build types without recomputing.
+    """
+    _resolve_engine(engine)
+    armor, slots, lead_slots = _parse_armor_config(armor_config)
+    compiled = CompiledArtifacts(artifacts)
+    fingerprint = _artifact_fingerprint(artifacts) if use_cache else None
+
+    return {
+        bt: _run_build(armor, slots, lead_slots, artifacts, bt, engine, use_cache, compiled, fingerprint)
+        for bt in BUILD_TYPES
+    }
+
+
+# Slot upgrade sweep:
+# Builds for every slot / lead container count the armor can be upgraded to.
+# The greedy engine only runs once per lead container count, the smaller slot counts are prefixes of that run.
+
+# Every (slots, lead containers) pair offered on the armor config screen
+def upgrade_options(armor: Armor) -> List[tuple]:
+    return [
+        (slots, lead)
+        for slots in range(armor.slots_base, armor.slots_total + 1)
+        for lead in range(armor.lead_containers_base, armor.lead_containers_total + 1)
+    ]
+
+def run_slot_sweep(
+    armor_config: Dict,
+    artifacts: List[Artifact],
+    build_type: str,
+    engine: str = "greedy",
+    use_cache: bool = True,
+) -> Dict[tuple, Dict[str, Any]]:
+    """
+    Runs the optimizer for every (slots, lead containers) upgrade of the armor.
+    Returns {(slots, lead containers): result}, results are the same format as run_model.
+    Greedy: one run with the most slots per lead container count, the rest are prefixes of it.
+    Exact: every pair is searched, but the stat matrix and fingerprint are shared.
+    Every result also goes in the run_model cache.
+    """
+    engine_name, _ = _resolve_engine(engine)
+    armor, _, _ = _parse_armor_config(armor_config)
+    build_type_clean = (build_type or "Balanced").strip()
+    compiled = CompiledArtifacts(artifacts)
+    fingerprint = _artifact_fingerprint(artifacts) if use_cache else None
+    options = upgrade_options(armor)
+
+    if engine_name != "greedy":
+        return {
+            (slots, lead): _run_build(armor, slots, lead, artifacts, build_type_clean, engine_name, use_cache,
+                compiled, fingerprint)
+            for slots, lead in options
+        }
+
+    # Pruning for the most slots is safe for every smaller slot count too
+    max_slots = max((slots for slots, _ in options), default=0)
+    candidates, removed = prune_dominated(compiled, max_slots)
+
+    results: Dict[tuple, Dict[str, Any]] = {}
+    for lead in sorted({lead for _, lead in options}):
+        slot_counts = [slots for slots, l in options if l == lead]
+
+        # Slot counts that aren't cached yet
+        missing = []
+        for slots in slot_counts:
+            cached = None
+            if use_cache:
+                key = _cache_key(armor, slots, lead, build_type_clean, engine_name, fingerprint)
+                cached = RESULT_CACHE.get(key)
+            if cached is not None:
+                results[(slots, lead)] = _copy_result(cached)
+                results[(slots, lead)]["build_type"] = build_type_clean
+            else:
+                missing.append(slots)
+        if not missing:
+            continue
+
+        picks = _greedy_picks(armor, candidates, max(missing), lead, build_type_clean)
+        for slots in missing:
+            chosen = [dict(item) for item in picks[:slots]]
+            _assign_lead_containers(chosen, lead)
+            result = _build_result(armor, slots, lead, build_type_clean, chosen, removed)
+            if use_cache:
+                key = _cache_key(armor, slots, lead, build_type_clean, engine_name, fingerprint)
+                RESULT_CACHE.put(key, _copy_result(result))
+            results[(slots, lead)] = result
+
+    return {option: results[option] for option in options}
+
+# Candidate generation:
+# Over the whole catalog most artifacts don't have any stat a build type rewards.
+# Those can only ever fill a slot (they add nothing and may cost radiation), so the stat index gives
+# the useful artifacts directly and only the lowest radiation fillers are kept in case there are
+# fewer useful artifacts than slots. Swapping a filler for a lower radiation one never lowers the score.
+
+# Score component each rewarded artifact stat feeds
+_STAT_COMPONENTS: Dict[str, str] = {
+    **{art_key: "protection" for art_keys in PROTECTION_KEYS.values() for art_key in art_keys},
+    "endurance": "endurance",
+    "increased_durability": "durability",
+    "bleeding_resistance": "bleed",
+    "weight": "weight",
+}
+
+def candidate_artifacts(catalog: Catalog, build_type: str, slots: int) -> List[Artifact]:
+    # Catalog artifacts that can be part of the best build for build_type, in catalog order
+    w = _build_weights(build_type)
+    useful: Dict[int, Artifact] = {}
+    for stat, component in _STAT_COMPONENTS.items():
+        if w[component] > 0.0:
+            for art in catalog.with_stat(stat):
+                useful[art.id] = art
+
+    fillers = [art for art in catalog.artifacts if art.id not in useful]
+    fillers.sort(key=lambda art: max(0, -art.radiation_balance))
+    return catalog.ordered(list(useful.values()) + fillers[:max(slots, 0)])
+
+# Alternate build:
+# The "best possible build" for the suit, using every artifact in the catalog.
+# It only depends on the armor config, so it is started in the background as soon as that is known
+# and is usually finished by the time the user has picked their artifacts.
+
+ALTERNATE_ENGINE = "exact"
+
+_ALTERNATE_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="abo-alternate")
+_ALTERNATE_FUTURES: Dict[tuple, Future] = {}
+_ALTERNATE_LOCK = threading.Lock()
+
+def run_alternate_builds(
+    armor_config: Dict,
+    catalog: Catalog,
+    engine: str = ALTERNATE_ENGINE,
+) -> Dict[str, Dict[str, Any]]:
+    # Alternate build for every build type, same format as run_all_build_types
+    # Each build type only searches its own candidates from the catalog index
+    _resolve_engine(engine)
+    armor, slots, lead_slots = _parse_armor_config(armor_config)
+    return {
+        bt: _run_build(armor, slots, lead_slots, candidate_artifacts(catalog, bt, slots), bt, engine, True)
+        for bt in BUILD_TYPES
+    }
+
+def request_alternate_builds(
+    armor_config: Dict,
+    catalog: Catalog,
+    engine: str = ALTERNATE_ENGINE,
+) -> Future:
+    """
+    Starts computing the alternate builds on the background worker.
+    Returns a Future with the run_alternate_builds result.
+    The same armor, slots, lead containers and catalog reuse the earlier Future,
+    so the work is only done once per configuration.
+    """
+    armor, slots, lead_slots = _parse_armor_config(armor_config)
+    key = (
+        _armor_fingerprint(armor),
+        slots,
+        lead_slots,
+        (engine or "greedy").lower(),
+        _artifact_fingerprint(catalog.artifacts),
+    )
+    with _ALTERNATE_LOCK:
+        future = _ALTERNATE_FUTURES.get(key)
+        # A failed run is retried instead of caching the error
+        if future is None or (future.done() and future.exception() is not None):
+            future = _ALTERNATE_EXECUTOR.submit(run_alternate_builds, armor_config, catalog, engine)
+            _ALTERNATE_FUTURES[key] = future
+        return future
\ No newline at end of file
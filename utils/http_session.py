@@ -0,0 +1,67 @@
+import threading
+from typing import TYPE_CHECKING
+
+# requests (with urllib3 and certifi) is imported on the first request, not while the window starts up
+if TYPE_CHECKING:
+    import requests
+
+# Shared HTTP session:
+# Catalog JSON and every armor/artifact image come from the same host,
+# so one pooled session keeps a handful of connections alive instead of a new TLS handshake per image.
+
+# Number of hosts to keep pools for, and connections kept alive per host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 8
+
+# Default timeout for every request (seconds)
+DEFAULT_TIMEOUT = 10
+
+# Retries for connection errors and temporary server errors
+# Waits 0.3s, 0.6s, 1.2s between attempts
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_SESSIONS: dict = {}
+_SESSIONS_LOCK = threading.Lock()
+
+def _make_session(retry: bool) -> "requests.Session":
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retries = Retry(
+        total=RETRY_TOTAL if retry else 0,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        # Hand the last response back so raise_for_status reports it
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        # Wait for a free connection instead of opening extra ones past the limit
+        pool_block=True,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session(retry: bool = True) -> "requests.Session":
+    """
+    Process wide session, created on first use.
+    retry=False gives a session that fails fast, for requests that have a local fallback
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(retry)
+        if session is None:
+            session = _make_session(retry)
+            _SESSIONS[retry] = session
+        return session
+
+def http_get(url: str, timeout: float = DEFAULT_TIMEOUT, retry: bool = True, **kwargs) -> "requests.Response":
+    # GET through the shared pool, always with a timeout
+    return get_session(retry).get(url, timeout=timeout, **kwargs)
@@ -0,0 +1,183 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from data.data_client import CACHE_DIR
+
+# Image cache:
+# Downloaded images are stored on disk by the SHA-256 of their content,
+# with an index from URL to content hash. The same picture behind two URLs is stored once.
+# Once an image is cached it loads from disk with no network round trip.
+
+IMAGE_CACHE_DIR = CACHE_DIR / "images"
+
+# Size cap for all cached images, ABO_IMAGE_CACHE_MB changes it
+IMAGE_CACHE_MAX_BYTES = int(float(os.environ.get("ABO_IMAGE_CACHE_MB", "200")) * 1024 * 1024)
+
+
+class ImageCache:
+    """
+    Content addressed image cache with LRU eviction.
+    blobs/<sha256> holds the image bytes, index.json maps URL -> hash, size and last use.
+    When the blobs go over max_bytes the least recently used URLs are dropped first.
+    Safe to use from image loading worker threads.
+    """
+
+    def __init__(self, directory: Path = IMAGE_CACHE_DIR, max_bytes: int = IMAGE_CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._index: dict | None = None
+        self._dirty = False
+
+    @property
+    def _blob_dir(self) -> Path:
+        return self.directory / "blobs"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.directory / "index.json"
+
+    # Index is read on first use so importing the module never touches the disk
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                self._index = json.loads(self._index_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self) -> None:
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._index_path.with_name("index.json.tmp")
+            tmp_path.write_text(json.dumps(self._index), encoding="utf-8")
+            os.replace(tmp_path, self._index_path)
+            self._dirty = False
+        except OSError as e:
+            print(f"Failed to save image cache index: {e}")
+
+    # Bytes of the cached image for this URL, None if it isn't cached (or the file is damaged)
+    def get(self, url: str) -> bytes | None:
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(url)
+            if entry is None:
+                self.misses += 1
+                return None
+            try:
+                content = (self._blob_dir / entry["hash"]).read_bytes()
+            except OSError:
+                content = None
+            # Content addressed, so a file that doesn't match its hash is damaged
+            if content is None or hashlib.sha256(content).hexdigest() != entry["hash"]:
+                self._drop(url)
+                self._save_index()
+                self.misses += 1
+                return None
+            entry["last_used"] = time.time()
+            self._dirty = True
+            self.hits += 1
+            return content
+
+    def put(self, url: str, content: bytes) -> None:
+        digest = hashlib.sha256(content).hexdigest()
+        with self._lock:
+            index = self._load_index()
+            blob_path = self._blob_dir / digest
+            try:
+                if not blob_path.exists():
+                    self._blob_dir.mkdir(parents=True, exist_ok=True)
+                    tmp_path = blob_path.with_name(digest + ".tmp")
+                    tmp_path.write_bytes(content)
+                    os.replace(tmp_path, blob_path)
+            except OSError as e:
+                print(f"Failed to cache image {url}: {e}")
+                return
+
+            old = index.get(url)
+            index[url] = {"hash": digest, "size": len(content), "last_used": time.time()}
+            # The URL used to point at other content, remove it if nothing else uses it
+            if old is not None and old["hash"] != digest:
+                self._remove_blob_if_unused(old["hash"])
+            self._evict()
+            self._save_index()
+
+    # Drop a URL and its blob if no other URL shares it
+    def _drop(self, url: str) -> None:
+        entry = self._index.pop(url, None)
+        if entry is not None:
+            self._remove_blob_if_unused(entry["hash"])
+
+    def _remove_blob_if_unused(self, digest: str) -> None:
+        if any(e["hash"] == digest for e in self._index.values()):
+            return
+        try:
+            (self._blob_dir / digest).unlink()
+        except OSError:
+            pass
+
+    # Total size of the stored blobs (shared blobs count once)
+    def _total_bytes(self) -> int:
+        sizes = {e["hash"]: e["size"] for e in self._index.values()}
+        return sum(sizes.values())
+
+    # Least recently used URLs go first until the cache fits under max_bytes
+    def _evict(self) -> None:
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        for url, _ in sorted(self._index.items(), key=lambda item: item[1]["last_used"]):
+            self._drop(url)
+            total = self._total_bytes()
+            if total <= self.max_bytes:
+                break
+
+    # Drop cached images whose content hash isn't the expected one anymore ({url: sha256})
+    # Returns how many were dropped
+    def discard_changed(self, expected: dict) -> int:
+        with self._lock:
+            index = self._load_index()
+            stale = [url for url, digest in expected.items() if url in index and index[url]["hash"] != digest]
+            for url in stale:
+                self._drop(url)
+            if stale:
+                self._save_index()
+            return len(stale)
+
+    # Write last-use times that changed since the last save
+    def flush(self) -> None:
+        with self._lock:
+            if self._dirty and self._index is not None:
+                self._save_index()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._load_index()
+            for url in list(self._index):
+                self._drop(url)
+            self._save_index()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            index = self._load_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(index),
+                "bytes": self._total_bytes(),
+                "max_bytes": self.max_bytes,
+            }
+
+
+IMAGE_CACHE = ImageCache()
+
+# Last-use times only change in memory while the app runs, save them on exit
+atexit.register(IMAGE_CACHE.flush)
\ No newline at end of file
@@ -1,28 +1,139 @@
-import requests
-from PyQt6.QtGui import QPixmap
-from PyQt6.QtCore import Qt
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+from PyQt6 import sip
+from PyQt6.QtGui import QColor, QImage, QPixmap
+from PyQt6.QtCore import QObject, Qt, pyqtSignal
+from data.data_client import read_bundled
+from utils.http_session import http_get
+from utils.image_cache import IMAGE_CACHE
 
-def load_pixmap_from_url(url: str, size=(96, 96)) -> QPixmap:
+# Pixmap cache:
+# Each view shows the same icons at its own size (80/72 for artifacts, 150/180 for armor).
+# Decoded originals and scaled copies are kept in memory, keyed by (url, size),
+# so a new size is scaled from the original without another download or decode.
+# Originals are kept as QImage so the loader threads can scale them.
+PIXMAP_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Threads that download and decode images for load_pixmap_async
+IMAGE_WORKERS = 4
+
+
+def _pixmap_bytes(pixmap: QPixmap | QImage) -> int:
+    return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+
+class PixmapCache:
     """
-    Downloads an image from the web and converts it to a Qt Pixmap.
+    Bounded LRU of decoded pixmaps, sized by their pixel memory.
+    The key (url, None) holds the decoded original (QImage), (url, (w, h)) a scaled QPixmap.
     """
-    if not url:
-        return QPixmap()
 
-    try:
+    def __init__(self, max_bytes: int = PIXMAP_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key) -> QPixmap | QImage | None:
+        with self._lock:
+            pixmap = self._entries.get(key)
+            if pixmap is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return pixmap
+
+    def put(self, key, pixmap: QPixmap | QImage) -> None:
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= _pixmap_bytes(old)
+            self._entries[key] = pixmap
+            self._bytes += _pixmap_bytes(pixmap)
+            # Oldest first, but never drop the entry that was just added
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _pixmap_bytes(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def info(self) -> dict:
+        with self._lock:
+            originals = sum(1 for _, size in self._entries if size is None)
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "originals": originals,
+                "scaled": len(self._entries) - originals,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+PIXMAP_CACHE = PixmapCache()
+
+
+def pixmap_cache_info() -> dict:
+    return PIXMAP_CACHE.info()
+
+
+def clear_pixmap_cache() -> None:
+    PIXMAP_CACHE.clear()
+
+
+def _cache_key(url: str, size) -> tuple:
+    return (url, tuple(size) if size else None)
+
+
+# Decoded full size image, from memory, the offline bundle, the disk cache or the network (in that order)
+def _load_original(url: str) -> QImage:
+    image = PIXMAP_CACHE.get((url, None))
+    if image is not None:
+        return image
+
+    content = read_bundled(url)
+    if content is None:
+        content = IMAGE_CACHE.get(url)
+    downloaded = content is None
+    if downloaded:
         # Network request
         # Always have a timeout, otherwise the app will hang forever if internet is down.
-        resp = requests.get(url, timeout=10)
+        # The shared session reuses pooled connections to the data host
+        resp = http_get(url, timeout=10)
         resp.raise_for_status()
+        content = resp.content
+
+    # Data conversion
+    image = QImage.fromData(content)
+
+    # Only cache images that actually decode, never an error page
+    if not image.isNull():
+        if downloaded:
+            IMAGE_CACHE.put(url, content)
+        PIXMAP_CACHE.put((url, None), image)
 
-        # Data conversion
-        pixmap = QPixmap()
-        pixmap.loadFromData(resp.content)
+    return image
+
+
+# Download, decode and scale. Only uses QImage so it is safe off the GUI thread
+def _load_image(url: str, size) -> QImage:
+    try:
+        image = _load_original(url)
 
         # Scaling
         # Scale immediately to save memory and ensure UI consistency
-        if size:
-            return pixmap.scaled(
+        if size and not image.isNull():
+            return image.scaled(
                 size[0], size[1],
                 # Prevent stretching/ distortion
                 Qt.AspectRatioMode.KeepAspectRatio,
@@ -30,10 +141,169 @@ def load_pixmap_from_url(url: str, size=(96, 96)) -> QPixmap:
                 Qt.TransformationMode.SmoothTransformation
             )
 
-        return pixmap
+        return image
 
     except Exception:
         # Failing gracefully:
-        # If image fails to load, just return an empty pixmap
+        # If image fails to load, just return an empty image
         # Prevents the whole app from crashing just because an icon is missing.
-        return QPixmap()
\ No newline at end of file
+        return QImage()
+
+
+def load_pixmap_from_url(url: str, size=(96, 96)) -> QPixmap:
+    """
+    Downloads an image from the web and converts it to a Qt Pixmap.
+    Images that were downloaded before are loaded from the disk cache instead,
+    and pixmaps already decoded/scaled this session come from memory.
+    Blocks until the image is in, views should use load_pixmap_async.
+    """
+    if not url:
+        return QPixmap()
+
+    key = _cache_key(url, size)
+    cached = PIXMAP_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    pixmap = QPixmap.fromImage(_load_image(url, size))
+    if size and not pixmap.isNull():
+        PIXMAP_CACHE.put(key, pixmap)
+    return pixmap
+
+
+# Async loading:
+# Views ask for an image with the widget that shows it (the owner).
+# The owner gets a placeholder right away and the real pixmap when the worker is done.
+# Every owner only waits for its latest request, and when the owner is destroyed
+# its request is dropped (and cancelled if nobody else is waiting for that image).
+
+_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=IMAGE_WORKERS, thread_name_prefix="image-loader")
+_PLACEHOLDERS: dict[tuple, QPixmap] = {}
+
+
+def _placeholder(size) -> QPixmap:
+    key = tuple(size) if size else (96, 96)
+    pixmap = _PLACEHOLDERS.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(key[0], key[1])
+        pixmap.fill(QColor(0, 0, 0, 60))
+        _PLACEHOLDERS[key] = pixmap
+    return pixmap
+
+
+class _ImageDispatcher(QObject):
+    """
+    Lives on the GUI thread and hands finished images to the widgets waiting for them.
+    The worker emits image_ready, Qt queues it onto the GUI thread.
+    """
+    image_ready = pyqtSignal(object, object)
+
+    def __init__(self):
+        super().__init__()
+        self._next_token = 0
+        # key -> Future, key -> {owner token: callback}, owner token -> key
+        self._pending = {}
+        self._waiters = {}
+        self._token_keys = {}
+        self.image_ready.connect(self._deliver)
+
+    def request(self, url: str, size, owner: QObject, on_ready: Callable[[QPixmap], None]) -> None:
+        token = self._owner_token(owner)
+        # The owner wants a new image, forget the old one
+        self.release(token)
+
+        key = _cache_key(url, size)
+        cached = PIXMAP_CACHE.get(key)
+        if cached is not None:
+            on_ready(cached)
+            return
+
+        on_ready(_placeholder(size))
+        self._waiters.setdefault(key, {})[token] = on_ready
+        self._token_keys[token] = key
+        if key in self._pending:
+            return
+
+        future = _IMAGE_EXECUTOR.submit(_load_image, url, size)
+        self._pending[key] = future
+        future.add_done_callback(lambda f, key=key: self._on_done(key, f))
+
+    # Runs on the worker thread (or right away if the future is already done)
+    def _on_done(self, key, future) -> None:
+        if not future.cancelled():
+            self.image_ready.emit(key, future.result())
+
+    def _deliver(self, key, image: QImage) -> None:
+        self._pending.pop(key, None)
+        waiters = self._waiters.pop(key, {})
+        for token in waiters:
+            self._token_keys.pop(token, None)
+
+        if image.isNull():
+            return
+        pixmap = QPixmap.fromImage(image)
+        PIXMAP_CACHE.put(key, pixmap)
+        for on_ready in waiters.values():
+            try:
+                on_ready(pixmap)
+            except RuntimeError:
+                # The widget went away between the request and the delivery
+                pass
+
+    # Stop waiting for the owner's image, cancel the download if nobody else wants it
+    def release(self, token: int) -> None:
+        key = self._token_keys.pop(token, None)
+        if key is None:
+            return
+        waiters = self._waiters.get(key, {})
+        waiters.pop(token, None)
+        if not waiters:
+            self._waiters.pop(key, None)
+            future = self._pending.pop(key, None)
+            if future is not None:
+                future.cancel()
+
+    # One token per owner, released when Qt destroys the widget
+    def _owner_token(self, owner: QObject) -> int:
+        token = getattr(owner, "_image_token", None)
+        if token is None:
+            token = self._next_token
+            self._next_token += 1
+            owner._image_token = token
+            owner.destroyed.connect(lambda _=None, token=token: self.release(token))
+        return token
+
+
+_DISPATCHER: _ImageDispatcher | None = None
+
+
+# Made on first use, which is on the GUI thread after the QApplication exists
+def _dispatcher() -> _ImageDispatcher:
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        _DISPATCHER = _ImageDispatcher()
+    return _DISPATCHER
+
+
+def load_pixmap_async(url: str, size, owner: QObject, on_ready: Callable[[QPixmap], None]) -> None:
+    """
+    Loads an image without blocking the GUI thread.
+    1.) Cached pixmaps are passed to on_ready straight away
+    2.) Otherwise on_ready gets a placeholder now and the real pixmap when a worker has it
+    3.) A new request for the same owner replaces the old one
+    4.) If the owner is destroyed first, the request is dropped
+    Must be called from the GUI thread.
+    """
+    if not url:
+        cancel_pixmap_request(owner)
+        return
+    if sip.isdeleted(owner):
+        return
+    _dispatcher().request(url, size, owner, on_ready)
+
+
+# Drop the owner's pending image (e.g. the view was cleared while it was loading)
+def cancel_pixmap_request(owner: QObject) -> None:
+    token = getattr(owner, "_image_token", None)
+    if token is not None and _DISPATCHER is not None:
+        _DISPATCHER.release(token)
\ No newline at end of file
@@ -1,4 +1,7 @@
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List
+
+if TYPE_CHECKING:
+    from data.catalog import Armor, Artifact
 
 # 5-bar armor UI - Each bar = 20
 BAR_MAX = 5
@@ -22,6 +25,10 @@ ARTIFACT_TO_ARMOR_STAT: Dict[str, str] = {
     "electrical_protection": "electrical",
 }
 
+# Build types the optimizer can aim for (also the order of the ML model's one hot encoding)
+# Kept here so the views don't have to import the optimizer (and NumPy) while the window starts up
+BUILD_TYPES: List[str] = ["Balanced", "Anomaly Protections", "Endurance", "Bleed Resistance"]
+
 # Convert 0-100 resistance into 0–5 bars
 def value_to_bars(value: int) -> int:
     bars = value // BAR_STEP
@@ -31,15 +38,13 @@ def value_to_bars(value: int) -> int:
         bars = BAR_MAX
     return bars
 
-# Return armor resistances as ints
-def armor_resistances(armor: Dict) -> Dict[str, int]:
-    res = armor.get("resistances", {})
-    return {k: int(v) for k, v in res.items()}
+# Return armor resistances (already ints, checked when the catalog was loaded)
+def armor_resistances(armor: "Armor") -> Dict[str, int]:
+    return dict(armor.resistances)
 
 # Returns a dictionary on how to draw the bars in the UI
 # Ex. for 50, there would be Full: 2 bars, Half: 1 bars, Empty: 2 bars
-def armor_resist_bars(armor: dict) -> dict:
-    res = armor.get("resistances", {})
+def resist_bars(res: Dict[str, int]) -> dict:
     bars = {}
 
     for key, value in res.items():
@@ -59,40 +64,26 @@ def armor_resist_bars(armor: dict) -> dict:
 
     return bars
 
+# Bars for the armor's base resistances
+def armor_resist_bars(armor: "Armor") -> dict:
+    return resist_bars(armor.resistances)
+
 # Return armor resistances after artifact bonuses
-def apply_artifact_resists(base_resists: Dict[str, int], artifacts: List[Dict]) -> Dict[str, int]:
+def apply_artifact_resists(base_resists: Dict[str, int], artifacts: List["Artifact"]) -> Dict[str, int]:
     result = dict(base_resists)
 
     for art in artifacts:
-        stats = art.get("stats", {})
-        for art_key, lvl in stats.items():
-            armor_key = ARTIFACT_TO_ARMOR_STAT.get(art_key)
-            if not armor_key:
-                continue
-
-            bonus = ARTIFACT_BONUS.get(int(lvl), 0)
+        for armor_key, bonus in art.resist_bonus:
             result[armor_key] = result.get(armor_key, 0) + bonus
 
     return result
 
 # Return resistance bar counts with artifacts applied
-def effective_resist_bars(armor: Dict, artifacts: List[Dict]) -> Dict[str, int]:
+def effective_resist_bars(armor: "Armor", artifacts: List["Artifact"]) -> Dict[str, int]:
     base = armor_resistances(armor)
     boosted = apply_artifact_resists(base, artifacts)
     return {name: value_to_bars(val) for name, val in boosted.items()}
 
 # Net artifact radiation after radio protection (positive = good / negative = bad)
-def compute_artifact_radiation_balance(artifacts: List[Dict]) -> int:
-    total_rad = 0
-    total_radio_prot = 0
-
-    for art in artifacts:
-        stats = art.get("stats", {})
-
-        lvl_rad = int(stats.get("radiation", 0))
-        lvl_radio_prot = int(stats.get("radio_protection", 0))
-
-        total_rad += ARTIFACT_BONUS.get(lvl_rad, 0)
-        total_radio_prot += ARTIFACT_BONUS.get(lvl_radio_prot, 0)
-
-    return total_radio_prot - total_rad
\ No newline at end of file
+def compute_artifact_radiation_balance(artifacts: List["Artifact"]) -> int:
+    return sum(art.radiation_balance for art in artifacts)
\ No newline at end of file
@@ -1,99 +1,307 @@
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
-import joblib
-from sklearn.ensemble import RandomForestRegressor
-from data.data_client import load_armor_data, load_artifact_data
-from utils.abo_model import _score_artifact_for_build, _armor_resists
-from utils.stats import ARTIFACT_BONUS
-
-BUILD_TYPES = [
-    "Balanced",
-    "Anomaly Protections",
-    "Endurance",
-    "Bleed Resistance",
-]
-
-def _build_features(armor_resists: Dict[str, float], art_stats: Dict, build_type: str) -> List[float]:
+from typing import List, Tuple
+import numpy as np
+from data.catalog import Armor, Artifact
+from data.data_client import CACHE_DIR, load_armor_data, load_artifact_data
+from utils.abo_model import (BUILD_TYPES, BUILD_WEIGHTS, MODEL_PATH, RESIST_FEATURES, STAT_COLUMNS, CompiledArtifacts,
+    ForestModel, _armor_resists, _feature_matrix, _greedy_picks, _resist_features, _score_components, _weight_vector)
+from utils.stats import apply_artifact_resists
+from utils.training_dataset import TrainingDataset
+
+# Forest settings
+N_ESTIMATORS = 200
+# Fixed seed for reproducible results
+RANDOM_STATE = 42
+
+# Warm start:
+# A retrain adds WARM_START_TREES trees fitted on the new rows (plus as many old ones) instead of fitting every tree again.
+# Past MAX_TREES trees, or when more than WARM_START_MAX_NEW of the rows are new, the forest is fitted from scratch.
+WARM_START_TREES = 25
+MAX_TREES = 400
+WARM_START_MAX_NEW = 0.5
+
+# Trajectories:
+# At runtime the model is asked about the resistances part way through a build, not only the base ones.
+# Every armor / build type / lead container count replays the greedy build on the whole catalog
+# and on this many random halves of it (users rarely own every artifact), and every resist state along the way is kept.
+SUBSET_TRAJECTORIES = 4
+
+# Armors handed to a worker process at a time
+ARMORS_PER_TASK = 8
+
+# Below this many greedy builds starting the process pool costs more than it saves
+POOL_MIN_BUILDS = 2000
+
+# Rows built (and appended to the dataset) at a time, bounds memory on big catalogs
+ROWS_PER_CHUNK = 500_000
+
+# Dataset and the fitted sklearn forest (kept for warm starts), ABO_TRAINING_DIR moves them somewhere else
+TRAINING_DIR = Path(os.environ.get("ABO_TRAINING_DIR", CACHE_DIR / "training"))
+FOREST_NAME = "forest.pkl"
+
+# Dataset columns, the features in _feature_matrix order
+FEATURE_NAMES: List[str] = (
+    [f"resist_{name}" for name in RESIST_FEATURES]
+    + [f"stat_{name}" for name in STAT_COLUMNS]
+    + [f"build_{name.lower().replace(' ', '_')}" for name in BUILD_TYPES]
+)
+DATASET_COLUMNS = {
+    **{name: "float32" for name in FEATURE_NAMES},
+    "target": "float64",
+    "state": "int32",
+    "artifact": "int32",
+}
+
+# Bump when the heuristic changes in a way BUILD_WEIGHTS doesn't show, the stored rows are then made again
+HEURISTIC_VERSION = 1
+
+# Artifact matrix of a worker process, compiled once by _init_worker
+_COMPILED: CompiledArtifacts | None = None
+
+
+def _init_worker(artifacts: List[Artifact]) -> None:
+    global _COMPILED
+    _COMPILED = CompiledArtifacts(artifacts)
+
+
+# Rows made under another feature layout or other weights mean something else, so they aren't reused
+def _dataset_schema() -> str:
+    schema = {"features": FEATURE_NAMES, "weights": BUILD_WEIGHTS, "heuristic": HEURISTIC_VERSION}
+    return hashlib.sha1(json.dumps(schema, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _armor_states(compiled: CompiledArtifacts, armor: Armor) -> List[List[float]]:
+    """
+    Resist states the optimizer passes through for one armor.
+    Every state is [build type index, RESIST_FEATURES...], taken before every pick (so the base resists are one of them).
+    The random halves are seeded by the armor, build type and containers, so the same catalog always replays the same builds
+    """
+    base = _armor_resists(armor)
+    n = len(compiled)
+    states = []
+    for b, build_type in enumerate(BUILD_TYPES):
+        states.append([b, *_resist_features(base)])
+        for lead in range(armor.lead_containers_total + 1):
+            rng = np.random.default_rng([armor.id, b, lead])
+            parts = [compiled] + [
+                compiled.subset(np.sort(rng.choice(n, size=max(1, n // 2), replace=False)))
+                for _ in range(SUBSET_TRAJECTORIES if n > 1 else 0)
+            ]
+            for part in parts:
+                resists = base
+                # Heuristic only, the model must not learn from its own earlier guesses
+                for pick in _greedy_picks(armor, part, armor.slots_total, lead, build_type, use_ml=False):
+                    states.append([b, *_resist_features(resists)])
+                    resists = apply_artifact_resists(resists, [pick["artifact"]])
+    return states
+
+
+# Runs in a worker process
+def _states_task(armors: List[Armor]) -> List[List[float]]:
+    return [state for armor in armors for state in _armor_states(_COMPILED, armor)]
+
+
+def collect_states(armors: List[Armor], artifacts: List[Artifact], workers: int) -> np.ndarray:
+    """
+    Unique resist states from replaying the greedy builds of every armor (states x [build type index, resists]).
+    Armors are split into tasks across a process pool (small catalogs or workers <= 1 run in this process)
+    """
+    if not armors or not artifacts:
+        return np.zeros((0, 1 + len(RESIST_FEATURES)))
+    tasks = [armors[i:i + ARMORS_PER_TASK] for i in range(0, len(armors), ARMORS_PER_TASK)]
+    n_builds = len(BUILD_TYPES) * (1 + SUBSET_TRAJECTORIES) * sum(a.lead_containers_total + 1 for a in armors)
+
+    if workers <= 1 or len(tasks) == 1 or n_builds < POOL_MIN_BUILDS:
+        _init_worker(artifacts)
+        parts = [_states_task(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), initializer=_init_worker,
+            initargs=(artifacts,)) as pool:
+            parts = list(pool.map(_states_task, tasks))
+
+    return np.unique(np.array([state for part in parts for state in part], dtype=np.float64), axis=0)
+
+
+def add_new_rows(dataset: TrainingDataset, compiled: CompiledArtifacts, states: np.ndarray) -> int:
     """
-    Feature Engineering:
-    Convert the objects (Armor, Artifacts, Desired Build) into flat list of numbers
-    that a random forest can understand.
+    Appends the rows for the (state, artifact) pairs the dataset doesn't have yet.
+    1.) States and artifacts (by their stats) get their dataset index, artifacts with the same stats share one
+    2.) Every state is paired with every artifact, pairs that already have a row are skipped
+    3.) X comes from the same _feature_matrix the app uses,
+        y is the heuristic score of _score_artifact_for_build at that state, both per build type for many rows at once
+    Returns how many rows were added
     """
+    stats, art_rows = np.unique(compiled.bonus, axis=0, return_index=True)
+    art_ids = dataset.artifact_ids(stats)
+    state_ids = dataset.state_ids(states)
+    added = 0
+
+    per_chunk = max(1, ROWS_PER_CHUNK // max(1, len(art_rows)))
+    for start in range(0, len(states), per_chunk):
+        chunk = np.arange(start, min(start + per_chunk, len(states)))
+        s_idx = np.repeat(chunk, len(art_rows))
+        a_idx = np.tile(np.arange(len(art_rows)), len(chunk))
+        new = ~dataset.has_pairs(state_ids[s_idx], art_ids[a_idx])
+        s_idx, a_idx = s_idx[new], a_idx[new]
+        if len(s_idx) == 0:
+            continue
+
+        X = np.empty((len(s_idx), len(FEATURE_NAMES)))
+        y = np.empty(len(s_idx))
+        for b, build_type in enumerate(BUILD_TYPES):
+            mask = states[s_idx, 0] == b
+            if not mask.any():
+                continue
+            resists = states[s_idx[mask], 1:]
+            rows = art_rows[a_idx[mask]]
+            X[mask] = _feature_matrix(compiled, rows, resists, build_type)
+            y[mask] = _score_components(compiled, rows, resists) @ _weight_vector(build_type)
+
+        values = {name: X[:, j] for j, name in enumerate(FEATURE_NAMES)}
+        values.update(target=y, state=state_ids[s_idx], artifact=art_ids[a_idx])
+        dataset.append(values)
+        added += len(s_idx)
+
+    # New states / artifacts are remembered even if every pair was already there
+    dataset.save_meta()
+    return added
 
-    # 1.) Context: What is the current armor resistances
-    feats = [
-        armor_resists.get("thermal", 0.0),
-        armor_resists.get("electrical", 0.0),
-        armor_resists.get("chemical", 0.0),
-        armor_resists.get("radiation", 0.0),
-        armor_resists.get("psi", 0.0),
-        armor_resists.get("physical", 0.0),
-    ]
-
-    # Helper to convert 1 into 10.0 (Artifacts used 1-5)
-    def lvl(name: str) -> float:
-        lvl_val = int(art_stats.get(name, 0))
-        return float(ARTIFACT_BONUS.get(lvl_val, 0))
-
-    # 2.) Candidate: What stats does this artifact provide
-    feats.extend([
-        lvl("thermal_protection"),
-        lvl("electrical_protection"),
-        lvl("chemical_protection"),
-        lvl("physical_protection"),
-        lvl("endurance"),
-        lvl("increased_durability"),
-        lvl("bleeding_resistance"),
-        lvl("weight"),
-        lvl("radiation"),
-        lvl("radio_protection"),
-    ])
-
-    # Goal: What is the desired build type the user selected (one hot encoding)
-    bt = build_type.lower()
-    feats.extend([
-        1.0 if bt == "balanced" else 0.0,
-        1.0 if bt == "anomaly protections" else 0.0,
-        1.0 if bt == "endurance" else 0.0,
-        1.0 if bt == "bleed resistance" else 0.0,
-    ])
-    return feats
+
+def _load_forest(path: Path):
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"Failed to load {path}, fitting a new forest: {e}")
+        return None
+
+
+def _save_forest(path: Path, forest) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        pickle.dump(forest, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def train_forest(dataset: TrainingDataset, forest_path: Path, workers: int, full: bool = False):
+    """
+    Fits the forest on the dataset, warm started from the saved forest when it can be.
+    1.) No saved forest, too many trees, too much new data or full=True: N_ESTIMATORS trees on every row
+    2.) Otherwise WARM_START_TREES trees are added, fitted on the new rows plus as many old rows
+        (so the new trees don't only know the part of the catalog that changed)
+    3.) Nothing new: the saved forest is used as it is
+    Returns the forest and how it was fitted
+    """
+    # sklearn is only needed to train, the app runs the exported forest with NumPy
+    from sklearn.ensemble import RandomForestRegressor
+
+    forest = None if full else _load_forest(forest_path)
+    trained = dataset.meta["trained_rows"]
+    new_rows = len(dataset) - trained
+    can_warm_start = (
+        forest is not None
+        and getattr(forest, "n_features_in_", None) == len(FEATURE_NAMES)
+        and 0 <= new_rows <= WARM_START_MAX_NEW * len(dataset)
+        and len(forest.estimators_) + WARM_START_TREES <= MAX_TREES
+    )
+
+    if can_warm_start and new_rows == 0:
+        return forest, "unchanged"
+
+    if can_warm_start:
+        rng = np.random.default_rng(RANDOM_STATE + len(forest.estimators_))
+        old = np.sort(rng.choice(trained, size=min(trained, new_rows), replace=False))
+        rows = np.concatenate([old, np.arange(trained, len(dataset))])
+        forest.set_params(n_estimators=len(forest.estimators_) + WARM_START_TREES, warm_start=True, n_jobs=workers)
+        forest.fit(dataset.matrix(FEATURE_NAMES, rows), dataset.column("target")[rows])
+        how = "warm start"
+    else:
+        forest = RandomForestRegressor(
+            # Number of trees
+            n_estimators=N_ESTIMATORS,
+            random_state=RANDOM_STATE,
+            # One tree per core at a time
+            n_jobs=workers,
+        )
+        forest.fit(dataset.matrix(FEATURE_NAMES), np.asarray(dataset.column("target")))
+        how = "full fit"
+
+    _save_forest(forest_path, forest)
+    dataset.meta["trained_rows"] = len(dataset)
+    dataset.save_meta()
+    return forest, how
+
+
+# Peak resident memory in MB of this process and of its biggest worker, None where the OS doesn't report it
+def _peak_memory_mb() -> Tuple[float | None, float | None]:
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children or None
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Train the ML model the optimizer blends into its scores.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+        help="processes for data generation and trees fitted in parallel (default: every core)")
+    parser.add_argument("--data-dir", type=Path, default=TRAINING_DIR,
+        help=f"training dataset directory (default {TRAINING_DIR})")
+    parser.add_argument("--full", action="store_true", help="fit every tree again instead of warm starting")
+    args = parser.parse_args()
+
+    if importlib.util.find_spec("sklearn") is None:
+        print("Training the model needs scikit-learn (pip install scikit-learn)")
+        return
+
     armors = load_armor_data()
     artifacts = load_artifact_data()
 
-    X, y = [], []
-
-    # Data generation loop
-    # We don't have a dataset of user choices so we have to simulate them.
-    # We calculate the right mathematical score for every combination and train the model to approximate that math.
-    # In a real app, 'y' would come from user feedback
-    for armor in armors:
-        armor_resists = _armor_resists(armor)
-        for art in artifacts:
-            stats = art.get("stats", {}) or {}
-            for bt in BUILD_TYPES:
-                # X = the input (Armor, Artifacts, and Build choice
-                feats = _build_features(armor_resists, stats, bt)
-                # y = the target (The calculated heuristic score)
-                score_info = _score_artifact_for_build(art, armor_resists, bt)
-                X.append(feats)
-                y.append(score_info["score"])
+    # Data generation, only the rows the dataset doesn't have yet
+    start = time.perf_counter()
+    states = collect_states(armors, artifacts, args.workers)
+    dataset = TrainingDataset(args.data_dir, DATASET_COLUMNS, _dataset_schema())
+    added = add_new_rows(dataset, CompiledArtifacts(artifacts), states)
+    generated = time.perf_counter()
+    if len(dataset) == 0:
+        print("No armor or artifact data to train on")
+        return
 
     # Model training
-    model = RandomForestRegressor(
-        # Number of trees
-        n_estimators=200,
-        # Fixed seed for reproducible results
-        random_state=42,
-    )
-    model.fit(X, y)
+    forest, how = train_forest(dataset, args.data_dir / FOREST_NAME, args.workers, args.full)
+    fitted = time.perf_counter()
 
     # Save the trained brain to a file so the main app can load it quickly.
-    out_path = Path(__file__).resolve().parent / "abo_ml_model.joblib"
-    joblib.dump(model, out_path)
+    # Exported as flat arrays, the app evaluates it with NumPy and never imports sklearn
+    ForestModel.from_sklearn(forest).save(MODEL_PATH)
+
+    # Report
+    print(f"{len(states)} resist states ({len(armors)} armors x {len(BUILD_TYPES)} build types), "
+          f"{added} new rows, {len(dataset)} rows in {args.data_dir}")
+    print(f"data generation {generated - start:.2f}s, fit {fitted - generated:.2f}s ({how}, "
+          f"{len(forest.estimators_)} trees), total {fitted - start:.2f}s, {args.workers} workers")
+    own, workers_peak = _peak_memory_mb()
+    if own is not None:
+        peak = f"peak memory {own:.0f} MB"
+        if workers_peak is not None:
+            peak += f" (largest worker {workers_peak:.0f} MB)"
+        print(peak)
+    print(f"Saved {MODEL_PATH}")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
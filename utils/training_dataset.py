@@ -0,0 +1,132 @@
+import json
+import os
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+
+# Training dataset:
+# Appendable, column by column store of the rows train_abo_model generates.
+# Every column is a raw little endian file (<column>.bin), meta.json says how many rows are valid
+# and which resist states / artifact stats the rows were made from.
+# A row is one (state, artifact) pair, so after a catalog change only the pairs that aren't stored yet are generated.
+
+DATASET_VERSION = 1
+META_NAME = "meta.json"
+
+
+
+class TrainingDataset:
+    """
+    columns: column name -> NumPy dtype, fixed when the dataset is created
+    schema: anything that changes what a row means (feature layout, heuristic weights).
+    A dataset made with another schema is started over.
+    Appends write the column files first and meta.json last, so a crash loses the append, never the dataset.
+    """
+
+    def __init__(self, directory: Path, columns: Dict[str, str], schema: str):
+        self.directory = Path(directory)
+        self.columns = {name: np.dtype(dtype).newbyteorder("<") for name, dtype in columns.items()}
+        self.schema = schema
+        self.meta = self._read_meta()
+        # (state index, artifact index) pairs already stored, loaded on first use
+        self._pair_codes: np.ndarray | None = None
+
+    def _read_meta(self) -> dict:
+        try:
+            meta = json.loads((self.directory / META_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            meta = None
+        if (not isinstance(meta, dict) or meta.get("version") != DATASET_VERSION
+                or meta.get("schema") != self.schema or meta.get("columns") != list(self.columns)):
+            if meta is not None:
+                print(f"Starting a new training dataset in {self.directory}")
+            meta = {
+                "version": DATASET_VERSION,
+                "schema": self.schema,
+                "columns": list(self.columns),
+                "rows": 0,
+                "states": [],
+                "artifacts": [],
+                "trained_rows": 0,
+            }
+        return meta
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.bin"
+
+    # Stored values of one column (memory mapped, read only)
+    def column(self, name: str) -> np.ndarray:
+        dtype = self.columns[name]
+        if len(self) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(self._path(name), dtype=dtype, mode="r", shape=(len(self),))
+
+    # Several columns side by side (rows x names), rows is a slice or an index array
+    def matrix(self, names: List[str], rows=slice(None), dtype=np.float32) -> np.ndarray:
+        columns = [self.column(name)[rows] for name in names]
+        out = np.empty((len(columns[0]) if columns else 0, len(names)), dtype=dtype)
+        for j, column in enumerate(columns):
+            out[:, j] = column
+        return out
+
+    def append(self, values: Dict[str, np.ndarray]) -> None:
+        n = len(next(iter(values.values())))
+        if n == 0:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        rows = len(self)
+        for name, dtype in self.columns.items():
+            column = np.ascontiguousarray(values[name], dtype=dtype)
+            path = self._path(name)
+            with open(path, "r+b" if path.exists() else "wb") as f:
+                # Bytes past the stored rows are left over from an append that never finished
+                f.truncate(rows * dtype.itemsize)
+                f.seek(rows * dtype.itemsize)
+                f.write(column.tobytes())
+        self.meta["rows"] = rows + n
+        self.save_meta()
+        if self._pair_codes is not None:
+            self._pair_codes = np.union1d(self._pair_codes, _pair_code(values["state"], values["artifact"]))
+
+    def save_meta(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / META_NAME
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.meta), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    # Index of every state / artifact row in the meta list, new ones are added to the end
+    def _register(self, key: str, values: np.ndarray) -> np.ndarray:
+        known = {tuple(item): i for i, item in enumerate(self.meta[key])}
+        ids = np.empty(len(values), dtype=np.int64)
+        for i, item in enumerate(np.asarray(values).tolist()):
+            item = tuple(item)
+            index = known.get(item)
+            if index is None:
+                index = len(self.meta[key])
+                known[item] = index
+                self.meta[key].append(list(item))
+            ids[i] = index
+        return ids
+
+    def state_ids(self, states: np.ndarray) -> np.ndarray:
+        return self._register("states", states)
+
+    def artifact_ids(self, stats: np.ndarray) -> np.ndarray:
+        return self._register("artifacts", stats)
+
+    # Mask of the (state, artifact) pairs that already have a row
+    def has_pairs(self, state_ids: np.ndarray, artifact_ids: np.ndarray) -> np.ndarray:
+        if self._pair_codes is None:
+            self._pair_codes = np.unique(_pair_code(
+                np.asarray(self.column("state"), dtype=np.int64),
+                np.asarray(self.column("artifact"), dtype=np.int64),
+            ))
+        return np.isin(_pair_code(state_ids, artifact_ids), self._pair_codes)
+
+
+def _pair_code(state_ids: np.ndarray, artifact_ids: np.ndarray) -> np.ndarray:
+    return (np.asarray(state_ids, dtype=np.int64) << 32) | np.asarray(artifact_ids, dtype=np.int64)
\ No newline at end of file
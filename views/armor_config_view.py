@@ -1,8 +1,9 @@
-from typing import Dict, Optional
+from typing import Optional
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtWidgets import (QWidget,  QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QFrame)
-from utils.image_loader import load_pixmap_from_url
+from utils.image_loader import load_pixmap_async
 from utils.stats import armor_resist_bars
+from data.catalog import Armor
 
 
 class ArmorConfigView(QWidget):
@@ -14,16 +15,16 @@ class ArmorConfigView(QWidget):
     back_requested = pyqtSignal()
     next_requested = pyqtSignal(dict)
 
-    def __init__(self, armor: Dict, parent: Optional[QWidget] = None):
+    def __init__(self, armor: Armor, parent: Optional[QWidget] = None):
         super().__init__(parent)
         self._armor = armor
 
-        # Parse the data safely using .get
-        self._slots_base = int(armor.get("slots_base", 0))
-        self._slots_total = int(armor.get("slots_total", self._slots_base))
+        # Slot ranges were validated when the catalog was loaded
+        self._slots_base = armor.slots_base
+        self._slots_total = armor.slots_total
 
-        self._lead_base = int(armor.get("lead_containers_base", 0))
-        self._lead_total = int(armor.get("lead_containers_total", self._lead_base))
+        self._lead_base = armor.lead_containers_base
+        self._lead_total = armor.lead_containers_total
 
         # Pre-calculate the bar visuals for the resistances from the base stats
         self._base_bar_values = armor_resist_bars(armor)
@@ -76,12 +77,10 @@ class ArmorConfigView(QWidget):
         # Image handling
         img_label = QLabel()
         img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        pixmap = load_pixmap_from_url(self._armor.get("image_url", ""), size=(180, 180))
-        if not pixmap.isNull():
-            img_label.setPixmap(pixmap)
+        load_pixmap_async(self._armor.image_url, (180, 180), img_label, img_label.setPixmap)
         armor_card_layout.addWidget(img_label)
 
-        name_label = QLabel(self._armor.get("name", "Unknown Armor"))
+        name_label = QLabel(self._armor.name)
         name_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         name_label.setStyleSheet("color: white; font-size: 18px; font-weight: bold;")
         armor_card_layout.addWidget(name_label)
@@ -1,21 +1,31 @@
-from typing import List, Dict, Optional
+from typing import List, Optional
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QPixmap, QIcon
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QScrollArea,QGridLayout, QButtonGroup, QToolButton)
-from utils.image_loader import load_pixmap_from_url
+from utils.image_loader import load_pixmap_async
+from data.catalog import Armor
 
 
 class ArmorSelectionView(QWidget):
     next_requested = pyqtSignal(dict)
 
-    def __init__(self, armors: List[Dict], parent: Optional[QWidget] = None):
+    def __init__(self, armors: Optional[List[Armor]] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
+        # None means the catalog is still loading
         self._armors = armors
-        self._selected_armor: Optional[Dict] = None
+        self._selected_armor: Optional[Armor] = None
+        self._grid: QGridLayout | None = None
 
         self._build_ui()
 
+    # Receive the armor list once the catalog has loaded
+    def set_armors(self, armors: List[Armor]):
+        self._armors = armors
+        self._selected_armor = None
+        self.next_button.setEnabled(False)
+        self._populate_grid()
+
     # UI setup
     def _build_ui(self):
         root_layout = QVBoxLayout(self)
@@ -61,37 +71,8 @@ class ArmorSelectionView(QWidget):
         self._button_group.setExclusive(True)
         self._button_group.buttonClicked.connect(self._on_button_clicked)
 
-        # Build grid
-        columns = 4
-        for index, armor in enumerate(self._armors):
-            row = index // columns
-            col = index % columns
-
-            btn = QToolButton()
-            btn.setCheckable(True)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-
-            # Put text under armor
-            btn.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextUnderIcon)
-            btn.setMinimumSize(230, 220)
-
-            # Set the data
-            name = armor.get("name", "Unknown Armor")
-            btn.setText(name)
-            btn.setStyleSheet(self._button_stylesheet(selected=False))
-
-            # Load the icon
-            pixmap = load_pixmap_from_url(armor.get("image_url", ""), size=(150, 150))
-            if not pixmap.isNull():
-                icon = QIcon(pixmap)
-                btn.setIcon(icon)
-                btn.setIconSize(QSize(150, 150))
-
-            # Keep a reference to the armor selected
-            btn.armor_data = armor
-
-            self._button_group.addButton(btn)
-            grid.addWidget(btn, row, col)
+        self._grid = grid
+        self._populate_grid()
 
         scroll.setWidget(scroll_container)
         root_layout.addWidget(scroll, stretch=1)
@@ -126,6 +107,56 @@ class ArmorSelectionView(QWidget):
         bottom_bar.addWidget(self.next_button)
         root_layout.addLayout(bottom_bar)
 
+    # Fill the grid with one button per armor (or a loading message while the catalog loads)
+    def _populate_grid(self):
+        grid = self._grid
+        for btn in self._button_group.buttons():
+            self._button_group.removeButton(btn)
+        while grid.count():
+            item = grid.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+        if self._armors is None:
+            loading = QLabel("Loading armor...")
+            loading.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            loading.setStyleSheet("color: white; font-size: 18px;")
+            grid.addWidget(loading, 0, 0)
+            return
+
+        # Build grid
+        columns = 4
+        for index, armor in enumerate(self._armors):
+            row = index // columns
+            col = index % columns
+
+            btn = QToolButton()
+            btn.setCheckable(True)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+
+            # Put text under armor
+            btn.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextUnderIcon)
+            btn.setMinimumSize(230, 220)
+
+            # Set the data
+            name = armor.name
+            btn.setText(name)
+            btn.setStyleSheet(self._button_stylesheet(selected=False))
+
+            # Load the icon in the background, a placeholder shows until it arrives
+            btn.setIconSize(QSize(150, 150))
+            load_pixmap_async(
+                armor.image_url, (150, 150), btn,
+                lambda pixmap, b=btn: b.setIcon(QIcon(pixmap))
+            )
+
+            # Keep a reference to the armor selected
+            btn.armor_data = armor
+
+            self._button_group.addButton(btn)
+            grid.addWidget(btn, row, col)
+
+
     # Styling helpers
     @staticmethod
     def _button_stylesheet(selected: bool) -> str:
@@ -1,8 +1,9 @@
 from typing import Dict, List, Optional
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QFrame, QScrollArea, QGridLayout)
-from utils.image_loader import load_pixmap_from_url
-from utils.stats import armor_resist_bars
+from utils.image_loader import load_pixmap_async
+from utils.stats import BUILD_TYPES, armor_resist_bars
+from data.catalog import Armor, Artifact
 
 
 class ArtifactConfigView(QWidget):
@@ -16,9 +17,9 @@ class ArtifactConfigView(QWidget):
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
 
-        self._armor: Optional[Dict] = None
+        self._armor: Optional[Armor] = None
         self._armor_config: Optional[Dict] = None
-        self._selected_artifacts: List[Dict] = []
+        self._selected_artifacts: List[Artifact] = []
         self._base_bar_values: Dict[str, Dict[str, int]] = {}
 
         self._armor_image_label: QLabel | None = None
@@ -30,7 +31,7 @@ class ArtifactConfigView(QWidget):
         self._build_ui()
 
     # Store armor config and artifacts
-    def set_context(self, armor_config: Dict, artifacts: List[Dict]):
+    def set_context(self, armor_config: Dict, artifacts: List[Artifact]):
         self._armor_config = armor_config
         self._armor = armor_config["armor"]
         self._selected_artifacts = artifacts
@@ -104,9 +105,7 @@ class ArtifactConfigView(QWidget):
 
         self._build_type_combo = QComboBox()
         self._build_type_combo.setFixedWidth(220)
-        self._build_type_combo.addItems(
-            ["Balanced", "Anomaly Protections", "Endurance", "Bleed Resistance"]
-        )
+        self._build_type_combo.addItems(BUILD_TYPES)
         self._build_type_combo.setStyleSheet(
             """
             QComboBox {
@@ -221,13 +220,13 @@ class ArtifactConfigView(QWidget):
         if not self._armor:
             return
 
-        pixmap = load_pixmap_from_url(self._armor.get("image_url", ""), size=(180, 180))
-        if not pixmap.isNull():
-            self._armor_image_label.setPixmap(pixmap)
-        else:
-            self._armor_image_label.clear()
+        self._armor_image_label.clear()
+        load_pixmap_async(
+            self._armor.image_url, (180, 180),
+            self._armor_image_label, self._armor_image_label.setPixmap
+        )
 
-        self._armor_name_label.setText(self._armor.get("name", "Unknown Armor"))
+        self._armor_name_label.setText(self._armor.name)
 
     # Build base resistance rows
     def _refresh_resistance_rows(self):
@@ -335,12 +334,10 @@ class ArtifactConfigView(QWidget):
 
             img = QLabel()
             img.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            pix = load_pixmap_from_url(art.get("image_url", ""), size=(72, 72))
-            if not pix.isNull():
-                img.setPixmap(pix)
+            load_pixmap_async(art.image_url, (72, 72), img, img.setPixmap)
             v.addWidget(img)
 
-            name_lbl = QLabel(art.get("name", "Unknown"))
+            name_lbl = QLabel(art.name)
             name_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             name_lbl.setStyleSheet("color: white; font-size: 12px;")
             v.addWidget(name_lbl)
@@ -1,8 +1,16 @@
-from typing import List, Dict, Optional
+from typing import List, Optional
 from PyQt6.QtCore import Qt, pyqtSignal, QSize
 from PyQt6.QtGui import QIcon
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QGridLayout, QToolButton,)
-from utils.image_loader import load_pixmap_from_url
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QScrollArea, QGridLayout, QToolButton,
+    QComboBox, QLineEdit)
+from utils.image_loader import load_pixmap_async
+from data.catalog import ARTIFACT_STATS, Armor, Catalog
+
+# Artifacts per grid row
+GRID_COLUMNS = 6
+
+# Stats offered in the filter (radiation is only ever a downside, so it isn't a filter)
+FILTER_STATS = [stat for stat in ARTIFACT_STATS if stat != "radiation"]
 
 
 class ArtifactSelectionView(QWidget):
@@ -13,18 +21,27 @@ class ArtifactSelectionView(QWidget):
     back_requested = pyqtSignal()
     next_requested = pyqtSignal(list)
 
-    def __init__(self, artifacts: List[Dict], parent: Optional[QWidget] = None):
+    def __init__(self, catalog: Optional[Catalog] = None, parent: Optional[QWidget] = None):
         super().__init__(parent)
-        self._artifacts = artifacts
-        self._armor: Optional[Dict] = None
+        # None means the catalog is still loading
+        self._catalog = catalog
+        self._armor: Optional[Armor] = None
         self._slots: int = 0
         self._containers: int = 0
         self._buttons: List[QToolButton] = []
+        self._grid: QGridLayout | None = None
 
         self._build_ui()
 
+    # Receive the catalog once it has loaded
+    def set_catalog(self, catalog: Catalog):
+        self._catalog = catalog
+        self._populate_grid()
+        self._apply_filter()
+        self._update_selected_label()
+
     # Receive the armor config from the main window
-    def set_context(self, armor: Dict, slots: int, containers: int):
+    def set_context(self, armor: Armor, slots: int, containers: int):
         self._armor = armor
         self._slots = slots
         self._containers = containers
@@ -42,6 +59,9 @@ class ArtifactSelectionView(QWidget):
         title.setStyleSheet("color: white; font-size: 22px; font-weight: bold;")
         root_layout.addWidget(title)
 
+        # Filter bar, answered by the catalog's stat index
+        root_layout.addLayout(self._build_filter_bar())
+
         # Scroll area with artifacts grid
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -69,36 +89,8 @@ class ArtifactSelectionView(QWidget):
         grid.setHorizontalSpacing(16)
         grid.setVerticalSpacing(16)
 
-        columns = 6
-        for index, art in enumerate(self._artifacts):
-            row = index // columns
-            col = index % columns
-
-            # Creates a toggleable button
-            btn = QToolButton()
-            # Acts as a 'checkbox'
-            btn.setCheckable(True)
-            btn.setCursor(Qt.CursorShape.PointingHandCursor)
-            btn.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextUnderIcon)
-            btn.setMinimumSize(140, 140)
-
-            name = art.get("name", "Artifact")
-            btn.setText(name)
-
-            # Artifact image loading
-            pixmap = load_pixmap_from_url(art.get("image_url", ""), size=(80, 80))
-            if not pixmap.isNull():
-                btn.setIcon(QIcon(pixmap))
-                btn.setIconSize(QSize(80, 80))
-
-            # Initial styling
-            btn.setStyleSheet(self._button_stylesheet(False))
-            # Connect the toggle signal to our handler
-            btn.toggled.connect(self._on_artifact_toggled)
-
-            btn.artifact_data = art
-            self._buttons.append(btn)
-            grid.addWidget(btn, row, col)
+        self._grid = grid
+        self._populate_grid()
 
         scroll.setWidget(container)
         root_layout.addWidget(scroll, stretch=1)
@@ -190,6 +182,103 @@ class ArtifactSelectionView(QWidget):
 
         root_layout.addLayout(bottom_bar)
 
+    def _build_filter_bar(self) -> QHBoxLayout:
+        filter_bar = QHBoxLayout()
+        filter_bar.setSpacing(12)
+        field_style = """
+            QLineEdit, QComboBox {
+                background-color: rgba(0, 0, 0, 160);
+                color: white;
+                border-radius: 6px;
+                padding: 4px 8px;
+                border: 1px solid rgba(255, 255, 255, 80);
+                font-size: 14px;
+            }
+            QComboBox::drop-down {
+                width: 28px;
+                border: 0px;
+            }
+        """
+
+        self._search_edit = QLineEdit()
+        self._search_edit.setPlaceholderText("Search artifacts...")
+        self._search_edit.setClearButtonEnabled(True)
+        self._search_edit.setFixedWidth(260)
+        self._search_edit.setStyleSheet(field_style)
+        self._search_edit.textChanged.connect(self._apply_filter)
+        filter_bar.addWidget(self._search_edit)
+
+        self._stat_combo = QComboBox()
+        self._stat_combo.setFixedWidth(230)
+        self._stat_combo.setStyleSheet(field_style)
+        self._stat_combo.addItem("Any stat", None)
+        for stat in FILTER_STATS:
+            self._stat_combo.addItem(stat.replace("_", " ").title(), stat)
+        self._stat_combo.currentIndexChanged.connect(self._apply_filter)
+        filter_bar.addWidget(self._stat_combo)
+
+        self._level_combo = QComboBox()
+        self._level_combo.setFixedWidth(120)
+        self._level_combo.setStyleSheet(field_style)
+        for level in range(1, 6):
+            self._level_combo.addItem(f"Level {level}+", level)
+        self._level_combo.currentIndexChanged.connect(self._apply_filter)
+        filter_bar.addWidget(self._level_combo)
+
+        filter_bar.addStretch(1)
+        return filter_bar
+
+    # Fill the grid with one toggle per artifact (or a loading message while the catalog loads)
+    def _populate_grid(self):
+        grid = self._grid
+        # Cards hidden by the filter aren't in the layout, so delete them through the list
+        for btn in self._buttons:
+            btn.deleteLater()
+        self._buttons = []
+        while grid.count():
+            item = grid.takeAt(0)
+            if item.widget():
+                item.widget().deleteLater()
+
+        if self._catalog is None:
+            loading = QLabel("Loading artifacts...")
+            loading.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            loading.setStyleSheet("color: white; font-size: 18px;")
+            grid.addWidget(loading, 0, 0)
+            return
+
+        columns = GRID_COLUMNS
+        for index, art in enumerate(self._catalog.artifacts):
+            row = index // columns
+            col = index % columns
+
+            # Creates a toggleable button
+            btn = QToolButton()
+            # Acts as a 'checkbox'
+            btn.setCheckable(True)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextUnderIcon)
+            btn.setMinimumSize(140, 140)
+
+            name = art.name
+            btn.setText(name)
+
+            # Artifact image loading (in the background)
+            btn.setIconSize(QSize(80, 80))
+            load_pixmap_async(
+                art.image_url, (80, 80), btn,
+                lambda pixmap, b=btn: b.setIcon(QIcon(pixmap))
+            )
+
+            # Initial styling
+            btn.setStyleSheet(self._button_stylesheet(False))
+            # Connect the toggle signal to our handler
+            btn.toggled.connect(self._on_artifact_toggled)
+
+            btn.artifact_data = art
+            self._buttons.append(btn)
+            grid.addWidget(btn, row, col)
+
     @staticmethod
     def _button_stylesheet(selected: bool) -> str:
         bg = "rgba(0, 0, 0, 160)" if not selected else "#2ecc71"
@@ -207,6 +296,35 @@ class ArtifactSelectionView(QWidget):
             }}
         """
 
+    # Show only the artifacts that match the search text and stat filter
+    # Hidden cards keep their selection, the shown ones are packed into the grid without gaps
+    def _apply_filter(self):
+        if self._catalog is None:
+            return
+
+        stat = self._stat_combo.currentData()
+        if stat:
+            matched = self._catalog.matching({stat: self._level_combo.currentData()})
+        else:
+            matched = self._catalog.artifacts
+        text = self._search_edit.text().strip().lower()
+        if text:
+            matched = [art for art in matched if text in art.name.lower()]
+        shown_ids = {art.id for art in matched}
+
+        for btn in self._buttons:
+            self._grid.removeWidget(btn)
+        shown = 0
+        for btn in self._buttons:
+            visible = btn.artifact_data.id in shown_ids
+            btn.setVisible(visible)
+            if visible:
+                self._grid.addWidget(btn, shown // GRID_COLUMNS, shown % GRID_COLUMNS)
+                shown += 1
+
+        # The level only matters once a stat is picked
+        self._level_combo.setEnabled(bool(stat))
+
     # Refresh selected amount value
     def _update_selected_label(self):
         count = sum(1 for b in self._buttons if b.isChecked())
@@ -225,10 +343,11 @@ class ArtifactSelectionView(QWidget):
             btn.setChecked(False)
         self._update_selected_label()
 
-    # Select all artifacts
+    # Select all artifacts (only the ones the filter shows)
     def _on_select_all(self):
         for btn in self._buttons:
-            btn.setChecked(True)
+            if not btn.isHidden():
+                btn.setChecked(True)
         self._update_selected_label()
 
     # Go back to armor config
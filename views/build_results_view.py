@@ -1,8 +1,10 @@
 from typing import Dict, List, Optional
 from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QGridLayout, QApplication)
-from utils.image_loader import load_pixmap_from_url
-from utils.stats import armor_resist_bars
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QScrollArea, QGridLayout, QApplication,
+    QTabBar, QButtonGroup)
+from utils.image_loader import load_pixmap_async, cancel_pixmap_request
+from utils.stats import resist_bars
+from data.catalog import Armor
 
 
 class BuildResultsView(QWidget):
@@ -12,15 +14,24 @@ class BuildResultsView(QWidget):
     a user-friendly format and informs them if the build is safe or unsafe
     """
     back_requested = pyqtSignal()
+    # Asks the main window for the armor upgrade builds of a build type
+    sweep_requested = pyqtSignal(str)
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
         # Placeholders for the data
-        self._armor: Dict | None = None
+        self._armor: Armor | None = None
         self._final_resists: Dict[str, int] = {}
         self._final_bars: Dict[str, Dict[str, int]] = {}
         self._chosen_artifacts: List[Dict] = []
         self._radiation_balance: int = 0
+        # Results for every build type, so switching tabs doesn't rerun the model
+        self._results: Dict[str, Dict] = {}
+        # Alternate build (every artifact in the catalog), filled in by the background worker
+        self._alternate_results: Dict[str, Dict] = {}
+        self._showing_alternate = False
+        # Builds for every (slots, lead containers) upgrade of the current build type
+        self._sweep_results: Dict[tuple, Dict] = {}
 
         # UI references for dynamic updates
         self._armor_image_label: QLabel | None = None
@@ -28,17 +39,74 @@ class BuildResultsView(QWidget):
         self._bars_container: QVBoxLayout | None = None
         self._artifacts_grid: QGridLayout | None = None
         self._radiation_label: QLabel | None = None
+        self._build_tabs: QTabBar | None = None
+        self._title_label: QLabel | None = None
+        self._alternate_btn: QPushButton | None = None
+        self._sweep_title: QLabel | None = None
+        self._sweep_scroll: QScrollArea | None = None
+        self._sweep_row: QHBoxLayout | None = None
+        self._sweep_group: QButtonGroup | None = None
 
         self._build_ui()
 
+    def set_results(self, results: Dict[str, Dict], build_type: str):
+        """
+        Populate the view with the results of every build type.
+        The tab for build_type is shown first, the others are a click away
+        """
+        self._results = results
+        self._set_showing_alternate(False)
+
+        # Rebuild the tabs without triggering a refresh for every tab added
+        self._build_tabs.blockSignals(True)
+        while self._build_tabs.count():
+            self._build_tabs.removeTab(0)
+        for name in results:
+            self._build_tabs.addTab(name)
+        self._build_tabs.setVisible(len(results) > 1)
+        self._build_tabs.blockSignals(False)
+
+        names = list(results)
+        if build_type in results:
+            self._build_tabs.setCurrentIndex(names.index(build_type))
+            self.set_context(results[build_type])
+        elif names:
+            self._build_tabs.setCurrentIndex(0)
+            self.set_context(results[names[0]])
+
+        self._request_sweep()
+
+    def set_sweep_results(self, build_type: str, sweep: Dict[tuple, Dict]):
+        """
+        Show the builds for every armor upgrade side by side.
+        Results for a build type that isn't on screen anymore are ignored
+        """
+        if build_type != self._build_tabs.tabText(self._build_tabs.currentIndex()):
+            return
+        self._sweep_results = sweep
+        self._refresh_sweep_cards()
+
+    def set_alternate_results(self, results: Optional[Dict[str, Dict]]):
+        """
+        Store the alternate build for every build type.
+        None means it is still being calculated, so the button stays disabled
+        """
+        self._alternate_results = results or {}
+        ready = bool(self._alternate_results)
+        self._alternate_btn.setEnabled(ready)
+        self._alternate_btn.setText("Alternate Build" if ready else "Alternate Build (calculating...)")
+        if not ready and self._showing_alternate:
+            self._set_showing_alternate(False)
+            self._on_build_tab_changed(self._build_tabs.currentIndex())
+
     def set_context(self, result: Dict):
         """
         Populate the view with the results from the model.
         Called immediately before showing the view
         """
-        self._armor = result.get("armor", {})
+        self._armor = result.get("armor")
         self._final_resists = result.get("final_resistances", {}) or {}
-        self._final_bars = armor_resist_bars({"resistances": self._final_resists})
+        self._final_bars = resist_bars(self._final_resists)
         self._chosen_artifacts = result.get("chosen_artifacts", []) or []
         self._radiation_balance = int(result.get("radiation_balance", 0))
 
@@ -56,10 +124,10 @@ class BuildResultsView(QWidget):
         root.setContentsMargins(40, 40, 40, 20)
         root.setSpacing(24)
 
-        title = QLabel("Build Results")
-        title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: white; font-size: 22px; font-weight: bold;")
-        root.addWidget(title)
+        self._title_label = QLabel("Build Results")
+        self._title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self._title_label.setStyleSheet("color: white; font-size: 22px; font-weight: bold;")
+        root.addWidget(self._title_label)
 
         main_row = QHBoxLayout()
         main_row.setSpacing(80)
@@ -102,6 +170,32 @@ class BuildResultsView(QWidget):
         right_col.setSpacing(16)
         main_row.addLayout(right_col, stretch=1)
 
+        # One tab per build type
+        self._build_tabs = QTabBar()
+        self._build_tabs.setExpanding(False)
+        self._build_tabs.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._build_tabs.currentChanged.connect(self._on_build_tab_changed)
+        self._build_tabs.setVisible(False)
+        self._build_tabs.setStyleSheet(
+            """
+            QTabBar::tab {
+                background-color: rgba(0, 0, 0, 160);
+                color: white;
+                padding: 6px 14px;
+                margin-right: 6px;
+                border-radius: 6px;
+                border: 1px solid rgba(255, 255, 255, 80);
+                font-weight: bold;
+            }
+            QTabBar::tab:selected {
+                background-color: #2ecc71;
+                border: 1px solid #a5f7b8;
+                color: black;
+            }
+            """
+        )
+        right_col.addWidget(self._build_tabs)
+
         # Radiation SAFE or UNSAFE
         self._radiation_label = QLabel("RADIATION STATUS: SAFE")
         self._radiation_label.setAlignment(Qt.AlignmentFlag.AlignLeft)
@@ -155,6 +249,43 @@ class BuildResultsView(QWidget):
         scroll.setWidget(container)
         right_col.addWidget(scroll, stretch=1)
 
+        # Armor upgrades: the same artifacts with every slot / lead container count side by side
+        self._sweep_title = QLabel("Armor Upgrades")
+        self._sweep_title.setStyleSheet(
+            "color: white; font-size: 16px; font-weight: bold;"
+        )
+        right_col.addWidget(self._sweep_title)
+
+        self._sweep_scroll = QScrollArea()
+        self._sweep_scroll.setWidgetResizable(True)
+        self._sweep_scroll.setFrameStyle(0)
+        self._sweep_scroll.setFixedHeight(96)
+        self._sweep_scroll.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._sweep_scroll.setStyleSheet(
+            """
+            QScrollArea {
+                background: transparent;
+                border: none;
+            }
+            QScrollArea > QWidget > QWidget {
+                background: transparent;
+            }
+            """
+        )
+
+        sweep_container = QWidget()
+        self._sweep_row = QHBoxLayout(sweep_container)
+        self._sweep_row.setContentsMargins(0, 0, 0, 0)
+        self._sweep_row.setSpacing(8)
+        self._sweep_row.setAlignment(Qt.AlignmentFlag.AlignLeft)
+
+        # Only one upgrade can be shown at a time
+        self._sweep_group = QButtonGroup(self)
+        self._sweep_group.setExclusive(True)
+
+        self._sweep_scroll.setWidget(sweep_container)
+        right_col.addWidget(self._sweep_scroll)
+
         # Bottom bar
         bottom = QHBoxLayout()
         bottom.setSpacing(16)
@@ -179,6 +310,35 @@ class BuildResultsView(QWidget):
 
         bottom.addStretch(1)
 
+        # Switch between the user's build and the alternate build
+        self._alternate_btn = QPushButton("Alternate Build (calculating...)")
+        self._alternate_btn.setCheckable(True)
+        self._alternate_btn.setEnabled(False)
+        self._alternate_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self._alternate_btn.toggled.connect(self._on_alternate_toggled)
+        self._alternate_btn.setStyleSheet(
+            """
+            QPushButton {
+                background-color: rgba(0, 0, 0, 160);
+                color: white;
+                padding: 8px 20px;
+                border-radius: 6px;
+                border: 1px solid rgba(255, 255, 255, 80);
+                font-weight: bold;
+            }
+            QPushButton:hover:!disabled { background-color: rgba(60, 60, 60, 200); }
+            QPushButton:checked {
+                background-color: #2ecc71;
+                border: 1px solid #a5f7b8;
+                color: black;
+            }
+            QPushButton:disabled { color: #aaaaaa; }
+            """
+        )
+        bottom.addWidget(self._alternate_btn)
+
+        bottom.addStretch(1)
+
         exit_btn = QPushButton("Exit")
         exit_btn.setCursor(Qt.CursorShape.PointingHandCursor)
         exit_btn.clicked.connect(self._on_exit_clicked)
@@ -201,17 +361,18 @@ class BuildResultsView(QWidget):
     # Update armor card content
     def _refresh_armor_card(self):
         if not self._armor:
+            cancel_pixmap_request(self._armor_image_label)
             self._armor_image_label.clear()
             self._armor_name_label.setText("")
             return
 
-        pixmap = load_pixmap_from_url(self._armor.get("image_url", ""), size=(180, 180))
-        if not pixmap.isNull():
-            self._armor_image_label.setPixmap(pixmap)
-        else:
-            self._armor_image_label.clear()
+        self._armor_image_label.clear()
+        load_pixmap_async(
+            self._armor.image_url, (180, 180),
+            self._armor_image_label, self._armor_image_label.setPixmap
+        )
 
-        self._armor_name_label.setText(self._armor.get("name", "Unknown Armor"))
+        self._armor_name_label.setText(self._armor.name)
 
     # Recursively delete all widgets and sub-layouts
     def _clear_layout(self, layout):
@@ -321,7 +482,7 @@ class BuildResultsView(QWidget):
 
         cols = 5
         for idx, item in enumerate(self._chosen_artifacts):
-            art = item.get("artifact", {})
+            art = item["artifact"]
             in_lead = bool(item.get("in_lead_container", False))
 
             row = idx // cols
@@ -330,7 +491,7 @@ class BuildResultsView(QWidget):
             card = QFrame()
             card.setObjectName("resultsArtifactCard")
 
-            desc = art.get("description")
+            desc = art.description
             if desc:
                 card.setToolTip(desc)
 
@@ -356,12 +517,10 @@ class BuildResultsView(QWidget):
 
             img = QLabel()
             img.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            pix = load_pixmap_from_url(art.get("image_url", ""), size=(72, 72))
-            if not pix.isNull():
-                img.setPixmap(pix)
+            load_pixmap_async(art.image_url, (72, 72), img, img.setPixmap)
             v.addWidget(img)
 
-            name_lbl = QLabel(art.get("name", "Unknown"))
+            name_lbl = QLabel(art.name)
             name_lbl.setAlignment(Qt.AlignmentFlag.AlignCenter)
             name_lbl.setStyleSheet("color: white; font-size: 14px;")
             v.addWidget(name_lbl)
@@ -389,6 +548,77 @@ class BuildResultsView(QWidget):
             f"color: {color}; font-size: 18px; font-weight: bold;"
         )
 
+    # Show the stored result of the build type that was clicked
+    def _on_build_tab_changed(self, index: int):
+        results = self._alternate_results if self._showing_alternate else self._results
+        result = results.get(self._build_tabs.tabText(index))
+        if result is not None:
+            self.set_context(result)
+        self._request_sweep()
+
+    # The upgrade sweep is only shown for the user's own build
+    def _request_sweep(self):
+        self._sweep_results = {}
+        self._refresh_sweep_cards()
+        if not self._showing_alternate and self._results:
+            self.sweep_requested.emit(self._build_tabs.tabText(self._build_tabs.currentIndex()))
+
+    # Rebuild the upgrade cards, the one on screen is checked
+    def _refresh_sweep_cards(self):
+        for btn in self._sweep_group.buttons():
+            self._sweep_group.removeButton(btn)
+        self._clear_layout(self._sweep_row)
+
+        visible = bool(self._sweep_results) and not self._showing_alternate
+        self._sweep_title.setVisible(visible)
+        self._sweep_scroll.setVisible(visible)
+        if not visible:
+            return
+
+        shown = self._results.get(self._build_tabs.tabText(self._build_tabs.currentIndex()), {})
+        shown_key = (shown.get("slots"), shown.get("lead_containers"))
+
+        for (slots, lead), result in self._sweep_results.items():
+            unsafe = int(result.get("radiation_balance", 0)) < 0
+            btn = QPushButton(
+                f"{slots} Slots / {lead} Lead\n"
+                f"{len(result.get('chosen_artifacts', []))} Artifacts\n"
+                f"{'UNSAFE' if unsafe else 'SAFE'}"
+            )
+            btn.setCheckable(True)
+            btn.setChecked((slots, lead) == shown_key)
+            btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            btn.setStyleSheet(
+                f"""
+                QPushButton {{
+                    background-color: rgba(0, 0, 0, 160);
+                    color: {"#ff5555" if unsafe else "white"};
+                    padding: 6px 12px;
+                    border-radius: 6px;
+                    border: 1px solid rgba(255, 255, 255, 80);
+                    font-size: 12px;
+                }}
+                QPushButton:checked {{
+                    border: 2px solid #2ecc71;
+                }}
+                """
+            )
+            btn.clicked.connect(lambda _checked, r=result: self.set_context(r))
+            self._sweep_group.addButton(btn)
+            self._sweep_row.addWidget(btn)
+
+    # Update the button and title without firing the toggled signal
+    def _set_showing_alternate(self, showing: bool):
+        self._showing_alternate = showing
+        self._alternate_btn.blockSignals(True)
+        self._alternate_btn.setChecked(showing)
+        self._alternate_btn.blockSignals(False)
+        self._title_label.setText("Alternate Build (All Artifacts)" if showing else "Build Results")
+
+    def _on_alternate_toggled(self, checked: bool):
+        self._set_showing_alternate(checked and bool(self._alternate_results))
+        self._on_build_tab_changed(self._build_tabs.currentIndex())
+
     def _on_back_clicked(self):
         # Emit back navigation
         self.back_requested.emit()